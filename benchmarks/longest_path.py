@@ -0,0 +1,41 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game.environment import action as act  # noqa: E402
+from game.environment.environment import Environment  # noqa: E402
+from game.solvers.breadth_first_search_longest import (  # noqa: E402
+    BreadthFirstSearchLongestPath,
+)
+from game.vector import Vector  # noqa: E402
+
+
+def bench(size: int, repeat: int) -> float:
+    env = Environment(size, size)
+    env.init_wall()
+    bfsl = BreadthFirstSearchLongestPath()
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        path = bfsl.longest_path(env, Vector(1, 1), Vector(1, 2),
+                                 act.RIGHT.vector)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f'{size}x{size}: {len(path)}/{env.available_tiles_count()} '
+          f'tiles in {best * 1000:.2f}ms')
+    return best
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Time BreadthFirstSearchLongestPath.longest_path "
+                    "across an empty board"
+    )
+    parser.add_argument("sizes", type=int, nargs="*", default=[12, 30, 50])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for s in args.sizes:
+        bench(s, args.repeat)
@@ -0,0 +1,312 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game import constants  # noqa: E402
+from game.environment import action as act  # noqa: E402
+from game.environment.environment import Environment  # noqa: E402
+from game.solvers import cycles  # noqa: E402
+from game.solvers.breadth_first_search_longest import (  # noqa: E402
+    BreadthFirstSearchLongestPath,
+)
+from game.solvers.breadth_first_search_shortest import (  # noqa: E402
+    BreadthFirstSearchShortestPath,
+)
+from game.solvers.hamiltonian_cycle import HamiltonianCycle  # noqa: E402
+from game.solvers.hamiltonian_cycle_optimised import (  # noqa: E402
+    HamiltonianCycleOptimised,
+)
+from game.synthetic import StateStore  # noqa: E402
+
+SIZES = [12, 20, 50, 100]
+OCCUPANCIES = [0.0, 0.5, 0.9]
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+# How much slower than the baseline a benchmark may be before it fails
+TOLERANCE = 0.5
+# Moves timed together by the step benchmark, and fruit by spawn
+STEPS = 64
+SPAWNS = 64
+SEED = 0
+# Iterations of the loop that every benchmark is timed relative to
+REFERENCE_LOOPS = 2000
+STATES = StateStore(
+    os.path.join(os.path.dirname(__file__), '..', constants.STATES_PATH)
+)
+
+# Makes a fresh state, untimed, then runs the code being timed on it
+Setup = Callable[[], Callable[[], object]]
+
+
+def occupied(size: int, occupancy: float) -> Tuple[Environment, List[int]]:
+    """
+    :return: A board of the given size, including its border, with a snake
+    lying along its serpentine cycle over the given fraction of the free
+    tiles, a fruit somewhere ahead of it, and the cycle. The Hamiltonian
+    cycle solvers only follow a cycle the snake already lies along, so
+    they are timed on these rather than on synthetic states.
+    """
+    env = Environment(size, size, seed=SEED)
+    env.init_wall()
+    cells = cycles.serpentine(size, size)
+    length = max(1, min(len(cells) - 2, round(occupancy * len(cells))))
+    body = [env.cell_vector(cell) for cell in reversed(cells[:length])]
+    ahead = env.cell_vector(cells[length]) - body[0]
+    env.place_snake(body, act.vector_to_action(ahead))
+    env.init_fruit()
+    return env, cells
+
+
+def synthetic(size: int, occupancy: float) -> Environment:
+    """
+    :return: A board with a random snake covering the given fraction of
+    its free tiles, as one would late in a game
+    """
+    return STATES.get(size, size, occupancy, SEED).environment(seed=SEED)
+
+
+def step(size: int, occupancy: float) -> Setup:
+    env, cells = occupied(size, occupancy)
+    state = env.save_state()
+    length = len(env.snake)
+    moves = [
+        act.vector_to_action(
+            env.cell_vector(cells[(length + i) % len(cells)]) -
+            env.cell_vector(cells[(length + i - 1) % len(cells)])
+        )
+        for i in range(STEPS)
+    ]
+
+    def setup():
+        env.load_state(state)
+
+        def run():
+            for move in moves:
+                env.step(move)
+        return run
+    return setup
+
+
+def spawn(size: int, occupancy: float) -> Setup:
+    env = synthetic(size, occupancy)
+
+    def run():
+        for _ in range(SPAWNS):
+            env.init_fruit()
+    return lambda: run
+
+
+def shortest_path(size: int, occupancy: float) -> Setup:
+    env = synthetic(size, occupancy)
+    bfss = BreadthFirstSearchShortestPath()
+    return lambda: lambda: bfss.shortest_path(
+        env, env.snake.head(), env.fruit.get_vector(),
+        env.snake.action.vector
+    )
+
+
+def longest_path(size: int, occupancy: float) -> Setup:
+    env = synthetic(size, occupancy)
+    bfsl = BreadthFirstSearchLongestPath()
+    return lambda: lambda: bfsl.longest_path(
+        env, env.snake.head(), env.fruit.get_vector(),
+        env.snake.action.vector
+    )
+
+
+def build_cycle(size: int, occupancy: float) -> Setup:
+    env, _ = occupied(size, occupancy)
+    hc = HamiltonianCycle()
+
+    def setup():
+        # Time building the cycle, not looking it up
+        cycles._cycles.clear()
+        return lambda: hc.build_cycle(env)
+    return setup
+
+
+def find_shortcut(size: int, occupancy: float) -> Setup:
+    env, _ = occupied(size, occupancy)
+    hco = HamiltonianCycleOptimised()
+    hco.next_action(env)
+    return lambda: lambda: hco._find_shortcut(env)
+
+
+BENCHMARKS: Dict[str, Callable[[int, float], Setup]] = {
+    'step': step,
+    'spawn': spawn,
+    'shortest_path': shortest_path,
+    'longest_path': longest_path,
+    'build_cycle': build_cycle,
+    '_find_shortcut': find_shortcut,
+}
+
+
+def reference() -> Callable[[], object]:
+    """
+    A fixed amount of plain Python work. Timing each benchmark relative to
+    it, measured just before, cancels out how fast the machine happens to
+    be running at the time.
+    """
+    def run():
+        total = 0
+        for i in range(REFERENCE_LOOPS):
+            total += i * i
+        return total
+    return run
+
+
+def measure(setup: Setup, rounds: int, round_time: float) -> float:
+    """
+    :return: Seconds per run in the fastest of several rounds, each
+    running for at least round_time
+    """
+    best = None
+    for _ in range(rounds):
+        runs, elapsed = 0, 0.0
+        while elapsed < round_time:
+            run = setup()
+            start = time.perf_counter()
+            run()
+            elapsed += time.perf_counter() - start
+            runs += 1
+        per_run = elapsed / runs
+        best = per_run if best is None else min(best, per_run)
+    return best
+
+
+def run_benchmark(key: str, rounds: int, round_time: float
+                  ) -> Tuple[float, float]:
+    """
+    :param key: The benchmark, board size and occupancy, e.g. step/20/0.5
+    :return: Seconds per run, and that relative to the reference
+    """
+    name, size, occupancy = key.split('/')
+    setup = BENCHMARKS[name](int(size), float(occupancy))
+    unit = measure(reference, rounds, round_time)
+    seconds = measure(setup, rounds, round_time)
+    cycles._cycles.clear()
+    print(f'{key:<30} {seconds * 1e6:>12.1f} us '
+          f'{seconds / unit:>10.3f} x reference', flush=True)
+    return seconds, seconds / unit
+
+
+def run_suite(keys: List[str], rounds: int, round_time: float
+              ) -> Dict[str, Tuple[float, float]]:
+    return {key: run_benchmark(key, rounds, round_time) for key in keys}
+
+
+def compare(results: Dict[str, Tuple[float, float]],
+            baseline: Dict[str, Tuple[float, float]],
+            tolerance: float) -> Dict[str, float]:
+    """
+    :return: How many times slower than its baseline, relative to the
+    reference, every benchmark more than tolerance slower is
+    """
+    regressions = {}
+    for key, (_, relative) in results.items():
+        if key not in baseline:
+            continue
+        ratio = relative / baseline[key][1]
+        if ratio > 1 + tolerance:
+            regressions[key] = ratio
+    return regressions
+
+
+def load(path: str) -> Optional[Dict[str, Tuple[float, float]]]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as fh:
+        data = json.load(fh)
+    return {
+        key: (seconds, data['relative'][key])
+        for key, seconds in data['seconds'].items()
+    }
+
+
+def save(path: str, results: Dict[str, Tuple[float, float]]):
+    with open(path, 'w') as fh:
+        json.dump({
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'seconds': {key: r[0] for key, r in results.items()},
+            'relative': {key: r[1] for key, r in results.items()},
+        }, fh, indent=2, sort_keys=True)
+        fh.write('\n')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Time the environment and solvers across board sizes "
+                    "and occupancies, and compare them to a baseline"
+    )
+    parser.add_argument("benchmarks", nargs="*", default=list(BENCHMARKS),
+                        help=f"Benchmarks to run, from "
+                             f"{', '.join(BENCHMARKS)}, or all of them")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES,
+                        help="Board sizes, including the border")
+    parser.add_argument("--occupancies", type=float, nargs="+",
+                        default=OCCUPANCIES,
+                        help="Fractions of the free tiles the snake covers")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--round-time", type=float, default=0.02,
+                        help="Seconds each round runs for at least")
+    parser.add_argument("--output", default=None,
+                        help="Write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="Fail if anything is more than this fraction "
+                             "slower than the baseline")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Save the results as the new baseline rather "
+                             "than comparing against it")
+    args = parser.parse_args()
+    for benchmark in args.benchmarks:
+        if benchmark not in BENCHMARKS:
+            parser.error(f'no benchmark called {benchmark}')
+
+    suite_results = run_suite(
+        [
+            f'{name}/{size}/{occupancy:g}' for name in args.benchmarks
+            for size in args.sizes for occupancy in args.occupancies
+        ],
+        args.rounds, args.round_time
+    )
+    if args.output is not None:
+        save(args.output, suite_results)
+    if args.update_baseline:
+        save(args.baseline, suite_results)
+        sys.exit(0)
+
+    baseline_results = load(args.baseline)
+    if baseline_results is None:
+        print(f'no baseline at {args.baseline}, run with --update-baseline')
+        sys.exit(0)
+    failures = compare(suite_results, baseline_results, args.tolerance)
+    if failures:
+        # Noise can make anything slow once, so only fail on what is
+        # still slow when measured again
+        print('\nmeasuring again:')
+        again = run_suite(list(failures), args.rounds, args.round_time)
+        for key, result in again.items():
+            suite_results[key] = min(suite_results[key], result,
+                                     key=lambda r: r[1])
+        failures = compare(
+            {key: suite_results[key] for key in failures},
+            baseline_results, args.tolerance
+        )
+    if failures:
+        print(f'\n{len(failures)} BENCHMARKS REGRESSED by more than '
+              f'{args.tolerance:.0%}:', file=sys.stderr)
+        for key, ratio in failures.items():
+            print(f'  {key}: {suite_results[key][1]:.3f} x reference is '
+                  f'{ratio:.2f}x the baseline '
+                  f'{baseline_results[key][1]:.3f}', file=sys.stderr)
+        sys.exit(1)
+    print(f'\nno benchmark regressed by more than {args.tolerance:.0%}')
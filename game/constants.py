@@ -1,9 +1,12 @@
 NAME = "Snake"
 FONT = "Arial"
-FPS = 10
+FPS = 60
+TPS = 10
 HORZ_TILES = 12  # 10 plus border
 VERT_TILES = 12  # 10 plus border
 SCREEN_WIDTH = 420
 SCREEN_HEIGHT = 420
 SCREEN_DEPTH = 32
 SCORES_PATH = 'scores'
+CYCLES_PATH = 'cycles'
+STATES_PATH = 'states'
@@ -0,0 +1,204 @@
+from typing import Optional, List
+
+import numpy as np
+
+from game.environment import action as act, death_reason
+from game.vector import Vector
+
+# Cell values in the occupancy grid
+EMPTY = 0
+WALL = 1
+SNAKE = 2
+FRUIT = 3
+
+# Actions are given as indices into act.ALL
+NO_ACTION = -1
+
+# Death reasons are returned as codes, 0 meaning the snake is still alive.
+# Actions are indices into act.ALL, so a move can never be too far or
+# diagonal, but the codes are kept so they line up with death_reason.
+REASONS = (
+    None,
+    death_reason.ILLEGAL_BACKWARDS,
+    death_reason.ILLEGAL_TOO_FAR,
+    death_reason.ILLEGAL_DIAGONAL,
+    death_reason.HIT_SNAKE,
+    death_reason.HIT_WALL,
+)
+ALIVE = 0
+ILLEGAL_BACKWARDS = 1
+HIT_SNAKE = 4
+HIT_WALL = 5
+
+
+class BatchedEnvironment:
+    """
+    Steps many boards of the same size at once.
+
+    Boards are kept in NumPy arrays rather than lists of Tile objects:
+    a flat occupancy grid per board, a ring buffer holding each snake
+    from tail to head, the fruit cell and an alive mask. A board whose
+    snake dies or wins stops moving until it is reset.
+    """
+    def __init__(self, boards: int, width: int, height: int,
+                 seed: Optional[int] = None):
+        self._boards = boards
+        self._width = width
+        self._height = height
+        self._cells = width * height
+        self._rng = np.random.default_rng(seed)
+        self._rows = np.arange(boards)
+
+        # Cell offsets for each action in act.ALL
+        self._deltas = np.array(
+            [a.vector.x + a.vector.y * width for a in act.ALL],
+            dtype=np.int64
+        )
+        # act.ALL is ordered so that the reverse of i is (i + 2) % 4
+        self._reverse = np.array([2, 3, 0, 1], dtype=np.int8)
+
+        self._walls = np.zeros(self._cells, dtype=np.uint8)
+        self._walls.reshape(height, width)[[0, -1], :] = WALL
+        self._walls.reshape(height, width)[:, [0, -1]] = WALL
+
+        self.grid = np.tile(self._walls, (boards, 1))
+        self.body = np.zeros((boards, self._cells), dtype=np.int64)
+        self.head_slot = np.zeros(boards, dtype=np.int64)
+        self.length = np.zeros(boards, dtype=np.int64)
+        self.action = np.full(boards, NO_ACTION, dtype=np.int8)
+        self.fruit = np.zeros(boards, dtype=np.int64)
+        self.alive = np.zeros(boards, dtype=bool)
+        self.won = np.zeros(boards, dtype=bool)
+        self.reason = np.zeros(boards, dtype=np.int8)
+
+        self.reset()
+
+    def __len__(self) -> int:
+        return self._boards
+
+    def available_tiles_count(self) -> int:
+        return (self._width - 2) * (self._height - 2)
+
+    def reset(self, boards: Optional[np.ndarray] = None):
+        """
+        Start a new game on the given boards, or on every board.
+        :param boards: Indices or a boolean mask of the boards to reset
+        """
+        if boards is None:
+            boards = self._rows
+        boards = self._rows[boards]
+        if len(boards) == 0:
+            return
+        self.grid[boards] = self._walls
+        self.length[boards] = 1
+        self.head_slot[boards] = 0
+        self.alive[boards] = True
+        self.won[boards] = False
+        self.reason[boards] = ALIVE
+
+        self._place_fruit(boards)
+        heads = self._random_empty_cells(boards)
+        self.grid[boards, heads] = SNAKE
+        self.body[boards, 0] = heads
+        self.action[boards] = self._random_actions(boards, heads)
+
+    def heads(self) -> np.ndarray:
+        return self.body[self._rows, self.head_slot]
+
+    def tails(self) -> np.ndarray:
+        return self.body[self._rows, self._tail_slots(self._rows)]
+
+    def reward(self) -> np.ndarray:
+        return self.length.copy()
+
+    def step(self, actions: np.ndarray) -> np.ndarray:
+        """
+        :param actions: One index into act.ALL per board
+        :return: The death reason code of each board, see REASONS.
+        Boards that were already dead or won report ALIVE.
+        """
+        actions = np.asarray(actions, dtype=np.int8)
+        reasons = np.zeros(self._boards, dtype=np.int8)
+        moving = self.alive.copy()
+
+        # Eliminate illegal moves
+        backwards = moving & (self.action != NO_ACTION) & (
+            self._reverse[actions] == self.action
+        )
+        reasons[backwards] = ILLEGAL_BACKWARDS
+        moving &= ~backwards
+
+        # Legal moves can still kill the snake
+        rows = self._rows[moving]
+        heads = self.body[rows, self.head_slot[rows]]
+        new = heads + self._deltas[actions[rows]]
+        at_new = self.grid[rows, new]
+        hit_snake = at_new == SNAKE
+        hit_wall = at_new == WALL
+        reasons[rows[hit_snake]] = HIT_SNAKE
+        reasons[rows[hit_wall]] = HIT_WALL
+
+        # Nothing bad ahead, move the head of each snake
+        safe = ~(hit_snake | hit_wall)
+        rows, new = rows[safe], new[safe]
+        self.action[rows] = actions[rows]
+        self.head_slot[rows] = (self.head_slot[rows] + 1) % self._cells
+        self.body[rows, self.head_slot[rows]] = new
+        self.grid[rows, new] = SNAKE
+        self.length[rows] += 1
+
+        # Snakes that didn't eat lose 1 tile from the tail
+        ate = new == self.fruit[rows]
+        hungry = rows[~ate]
+        tails = self.body[hungry, self._tail_slots(hungry)]
+        self.grid[hungry, tails] = EMPTY
+        self.length[hungry] -= 1
+
+        # Snakes that ate either won or need a new fruit
+        fed = rows[ate]
+        won = fed[self.length[fed] == self.available_tiles_count()]
+        self.won[won] = True
+        self.alive[won] = False
+        self._place_fruit(fed[~self.won[fed]])
+
+        dead = reasons != ALIVE
+        self.alive[dead] = False
+        self.reason[dead] = reasons[dead]
+        return reasons
+
+    def snake_vectors(self, board: int) -> List[Vector]:
+        """
+        :return: The snake on a board from head to tail
+        """
+        slots = (self.head_slot[board] - np.arange(self.length[board])) \
+            % self._cells
+        return [self.vector_of(c) for c in self.body[board, slots]]
+
+    def vector_of(self, cell: int) -> Vector:
+        return Vector(int(cell) % self._width, int(cell) // self._width)
+
+    def _tail_slots(self, boards: np.ndarray) -> np.ndarray:
+        return (self.head_slot[boards] - self.length[boards] + 1) \
+            % self._cells
+
+    def _place_fruit(self, boards: np.ndarray):
+        if len(boards) == 0:
+            return
+        cells = self._random_empty_cells(boards)
+        self.grid[boards, cells] = FRUIT
+        self.fruit[boards] = cells
+
+    def _random_empty_cells(self, boards: np.ndarray) -> np.ndarray:
+        # Give each empty cell a random key and take the largest
+        keys = self._rng.random((len(boards), self._cells))
+        keys[self.grid[boards] != EMPTY] = -1
+        return keys.argmax(axis=1)
+
+    def _random_actions(self, boards: np.ndarray,
+                        heads: np.ndarray) -> np.ndarray:
+        # Pick any action that doesn't move into a wall or the snake
+        neighbours = heads[:, None] + self._deltas[None, :]
+        at = self.grid[boards[:, None], neighbours]
+        keys = self._rng.random((len(boards), len(act.ALL)))
+        keys[(at == WALL) | (at == SNAKE)] = -1
+        return keys.argmax(axis=1).astype(np.int8)
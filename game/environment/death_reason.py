@@ -1,10 +1,43 @@
+from typing import Optional
+
+
 class DeathReason:
+    """
+    There is one of each reason, so they are compared by identity.
+    """
     def __init__(self, reason: str):
         self.reason = reason
 
+    def __reduce__(self):
+        # Unpickle, e.g. in a result sent back from a worker process, to
+        # the same reason rather than a copy of it
+        return from_code, (to_code(self),)
+
 
 ILLEGAL_BACKWARDS = DeathReason("Tried to move backwards")
 ILLEGAL_TOO_FAR = DeathReason("Tried to move > 1 tile away")
 ILLEGAL_DIAGONAL = DeathReason("Tried to move diagonally")
 HIT_SNAKE = DeathReason("Hit snake")
 HIT_WALL = DeathReason("Hit wall")
+# Not a death in the environment: the runner ended a game that had gone
+# too long without the snake eating
+STALLED = DeathReason("Stalled without eating")
+
+ALL = (
+    ILLEGAL_BACKWARDS, ILLEGAL_TOO_FAR, ILLEGAL_DIAGONAL, HIT_SNAKE, HIT_WALL,
+    STALLED,
+)
+
+# Stands for no death reason, when the game was won
+WON_CODE = 0
+
+
+def to_code(reason: Optional[DeathReason]) -> int:
+    """
+    :return: A small number standing for the reason, for storing compactly
+    """
+    return WON_CODE if reason is None else ALL.index(reason) + 1
+
+
+def from_code(code: int) -> Optional[DeathReason]:
+    return None if code == WON_CODE else ALL[code - 1]
@@ -1,15 +1,40 @@
+from __future__ import annotations
 import random
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List, Tuple
 from game.environment import action as act, tile, death_reason
 from game.environment.objects import Snake, Fruit, Object
 from game.vector import Vector, within_distance, is_diagonal
 
+if TYPE_CHECKING:
+    from game.replay import ReplayRecorder
+
 
 class Environment:
-    def __init__(self, width: int, height: int):
+    """
+    The board is stored as a flat list of tiles. A tile's cell is its
+    index in that list, y * width + x, and each cell has a single shared
+    Vector so looking one up never allocates.
+    """
+    def __init__(self, width: int, height: int, seed: Optional[int] = None):
+        """
+        :param seed: Seeds where fruit and snakes are placed, so that the
+        same seed and moves always play out the same game
+        """
         self._width = width
         self._height = height
-        self._tiles = []
+        self._random = random.Random(seed)
+        self._tiles: List[tile.Tile] = []
+        self._cell_vectors: List[Vector] = []
+        self._neighbours: List[Tuple[int, ...]] = []
+        # Every EMPTY cell, and where it is in the list. Spawning picks a
+        # random entry, and cells are swap-removed when they are filled.
+        self._free: List[int] = []
+        self._free_slots: List[int] = []
+        # Cells whose tile has changed since they were last collected, if
+        # anything is tracking changes
+        self._changed: Optional[List[int]] = None
+        # Told about every step, if anything is recording the game
+        self.recorder: Optional[ReplayRecorder] = None
         self.fruit = Fruit()
         self.wall = Object()
         self.snake = Snake()
@@ -17,17 +42,88 @@ class Environment:
         self._build_tiles()
 
     def _build_tiles(self):
-        # Build 2d list of empty tiles
+        # Build a flat list of empty tiles
         for y in range(0, self._height):
-            self._tiles.append([])
             for x in range(0, self._width):
-                self._tiles[y].append(tile.EMPTY)
+                self._free_slots.append(len(self._free))
+                self._free.append(len(self._tiles))
+                self._tiles.append(tile.EMPTY)
+                self._cell_vectors.append(Vector(x, y))
+        # Adjacent cells in the same order as act.ALL
+        for vector in self._cell_vectors:
+            self._neighbours.append(tuple(
+                self.cell_of(vector + a.vector) for a in act.ALL
+                if self.tile_at(vector + a.vector) is not None
+            ))
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    def cells_count(self) -> int:
+        return len(self._tiles)
+
+    def cell_of(self, vector: Vector) -> int:
+        return vector.y * self._width + vector.x
+
+    def cell_vector(self, cell: int) -> Vector:
+        return self._cell_vectors[cell]
+
+    def tile_at_cell(self, cell: int) -> tile.Tile:
+        return self._tiles[cell]
+
+    def neighbours(self, cell: int) -> Tuple[int, ...]:
+        """
+        :return: The cells next to cell, in the same order as act.ALL
+        """
+        return self._neighbours[cell]
+
+    def track_changes(self):
+        """
+        Start recording which cells change, to be collected with
+        pop_changes.
+        """
+        self._changed = []
+
+    def pop_changes(self) -> List[int]:
+        """
+        :return: The cells that have changed since the last call, possibly
+        more than once each
+        """
+        changed = self._changed
+        if changed is None:
+            return []
+        self._changed = []
+        return changed
+
+    def _set_tile(self, cell: int, t: tile.Tile):
+        old = self._tiles[cell]
+        self._tiles[cell] = t
+        if self._changed is not None:
+            self._changed.append(cell)
+        if old == tile.EMPTY and t != tile.EMPTY:
+            # Swap the last free cell into this cell's slot
+            slot = self._free_slots[cell]
+            last = self._free.pop()
+            if last != cell:
+                self._free[slot] = last
+                self._free_slots[last] = slot
+        elif old != tile.EMPTY and t == tile.EMPTY:
+            self._free_slots[cell] = len(self._free)
+            self._free.append(cell)
 
     def step(self, action: act.Action) -> Optional[death_reason.DeathReason]:
         """
         :param action: The action for the snake to perform
         :return: False if the move resulted in death, otherwise True
         """
+        if self.recorder is not None:
+            self.recorder.record(action)
+
         # Eliminate illegal moves
         if self.snake.action.vector.is_reverse(action.vector):
             # Snake's head can't go backwards
@@ -40,23 +136,22 @@ class Environment:
             return death_reason.ILLEGAL_DIAGONAL
 
         # Specified action is a legal move, but can still kill the snake
-        head = self.snake.head()
-        new = act.Vector(
-            head.x + action.vector.x,
-            head.y + action.vector.y,
+        new_cell = self.cell_of(self.snake.head()) + self.cell_of(
+            action.vector
         )
+        t = self._tiles[new_cell]
 
-        if self.snake.at_vector(new):
+        if t == tile.SNAKE:
             # New position is populated by snake
             return death_reason.HIT_SNAKE
-        if self.wall.at_vector(new):
+        if t == tile.WALL:
             # New position is populated by wall
             return death_reason.HIT_WALL
 
         # Nothing bad ahead, move the head of the snake
         self.snake.action = action
-        self.snake.move_to(new)
-        self._tiles[new.y][new.x] = tile.SNAKE
+        self.snake.move_to(self._cell_vectors[new_cell])
+        self._set_tile(new_cell, tile.SNAKE)
 
         # If the new vector is at fruit, we can eat it
         can_eat = self._can_eat_fruit()
@@ -67,7 +162,7 @@ class Environment:
 
         # There was no fruit, so remove 1 tile from the tail
         tail = self.snake.remove_tail()
-        self._tiles[tail.y][tail.x] = tile.EMPTY
+        self._set_tile(self.cell_of(tail), tile.EMPTY)
         return None
 
     def reward(self) -> int:
@@ -77,75 +172,132 @@ class Environment:
         return self.snake.head() == self.fruit.get_vector()
 
     def init_wall(self):
-        self._clear_tiles(tile.WALL)
+        self._clear_vectors(self.wall.get_vectors(), tile.WALL)
+        wall_vectors = []
         # Build walls on the left and right
         for y in range(0, self._height):
             left_x = 0
             right_x = self._width - 1
-            self._tiles[y][left_x] = tile.WALL
-            self._tiles[y][right_x] = tile.WALL
+            wall_vectors.append(self._cell_vectors[y * self._width + left_x])
+            wall_vectors.append(self._cell_vectors[y * self._width + right_x])
 
         # Build walls at top and bottom
         for x in range(1, self._width-1):
             top_y = 0
             bottom_y = self._height - 1
-            self._tiles[top_y][x] = tile.WALL
-            self._tiles[bottom_y][x] = tile.WALL
-        self.wall = Object(self._vectors_of(tile.WALL))
-
-    def init_fruit(self):
-        # Place a new fruit at a random position
-        self._clear_tiles(tile.FRUIT)
-        random_position = self._random_available_position()
-        self._tiles[random_position.x][random_position.y] = tile.FRUIT
-        self.fruit = Fruit(self._vector_of(tile.FRUIT))
-
-    def init_snake(self):
-        # Place a new snake at a random position
-        self._clear_tiles(tile.SNAKE)
-        random_position = self._random_available_position()
-        self._tiles[random_position.x][random_position.y] = tile.SNAKE
-        self.snake = Snake([self._vector_of(tile.SNAKE)])
-        self.snake.action = self.random_action()
+            wall_vectors.append(self._cell_vectors[top_y * self._width + x])
+            wall_vectors.append(
+                self._cell_vectors[bottom_y * self._width + x]
+            )
+
+        for vector in wall_vectors:
+            self._set_tile(self.cell_of(vector), tile.WALL)
+        self.wall = Object(wall_vectors)
+
+    def init_fruit(self, position: Optional[Vector] = None):
+        # Place a new fruit at the given position, or a random one
+        self._clear_vectors(self.fruit.get_vectors(), tile.FRUIT)
+        if position is None:
+            position = self._random_available_position()
+        self._set_tile(self.cell_of(position), tile.FRUIT)
+        self.fruit = Fruit(position)
+
+    def init_snake(self, position: Optional[Vector] = None,
+                   action: Optional[act.Action] = None):
+        # Place a new snake at the given position, or a random one
+        self._clear_vectors(self.snake.get_vectors(), tile.SNAKE)
+        if position is None:
+            position = self._random_available_position()
+        self._set_tile(self.cell_of(position), tile.SNAKE)
+        self.snake = Snake([position])
+        if action is None:
+            action = self.random_action()
+        self.snake.action = action
+
+    def place_snake(self, vectors: List[Vector], action: act.Action):
+        """
+        Replace the snake with one lying over the given vectors, head
+        first, which must be empty and each next to the one before.
+        """
+        self._clear_vectors(self.snake.get_vectors(), tile.SNAKE)
+        for vector in vectors:
+            if self.tile_at(vector) != tile.EMPTY:
+                raise Exception(f'can not place the snake on {vector}')
+            self._set_tile(self.cell_of(vector), tile.SNAKE)
+        self.snake = Snake(list(vectors), action)
+
+    def reseed(self, seed: int):
+        """
+        Restart the random number generator, and put the free cells in a
+        fixed order. From here on, how the environment plays out depends
+        only on its tiles, the seed and the moves made.
+        """
+        self._random = random.Random(seed)
+        self._free.sort()
+        for slot, cell in enumerate(self._free):
+            self._free_slots[cell] = slot
+
+    def new_game(self, seed: int):
+        """
+        Clear the snake and fruit and place new ones, so that everything
+        about the game from here on follows from the seed.
+        """
+        self._clear_vectors(self.snake.get_vectors(), tile.SNAKE)
+        self._clear_vectors(self.fruit.get_vectors(), tile.FRUIT)
+        self.snake = Snake()
+        self.fruit = Fruit()
+        self.reseed(seed)
+        self.init_fruit()
+        self.init_snake()
+        self.reseed(seed)
+
+    def save_state(self) -> tuple:
+        """
+        :return: Everything needed to put the environment back as it is
+        now with load_state
+        """
+        return (
+            list(self._tiles), list(self._free), list(self._free_slots),
+            list(self.snake.get_vectors()), self.snake.action,
+            self.fruit.get_vector(), self._random.getstate()
+        )
+
+    def load_state(self, state: tuple):
+        tiles, free, free_slots, snake, action, fruit, random_state = state
+        self._tiles = list(tiles)
+        self._free = list(free)
+        self._free_slots = list(free_slots)
+        self.snake = Snake(list(snake), action)
+        self.fruit = Fruit(fruit)
+        self._random.setstate(random_state)
+        if self._changed is not None:
+            self._changed.extend(range(len(self._tiles)))
 
     def random_action(self) -> act.Action:
         possible_actions = []
+        head_cell = self.cell_of(self.snake.head())
         for a in act.ALL:
-            if self.tile_at(self.snake.head() + a.vector) == tile.WALL:
+            t = self._tiles[head_cell + self.cell_of(a.vector)]
+            if t == tile.WALL:
                 continue
-            if self.tile_at(self.snake.head() + a.vector) == tile.SNAKE:
+            if t == tile.SNAKE:
                 continue
             possible_actions.append(a)
-        return random.choice(possible_actions)
-
-    def _vectors_of(self, t: tile.Tile) -> List[Vector]:
-        vectors = []
-        for y in range(0, self._height):
-            for x in range(0, self._width):
-                if self._tiles[y][x] == t:
-                    vectors.append(Vector(x, y))
-        return vectors
-
-    def _vector_of(self, t: tile.Tile) -> Optional[Vector]:
-        for y in range(0, self._height):
-            for x in range(0, self._width):
-                if self._tiles[y][x] == t:
-                    return Vector(x, y)
-        return None
+        return self._random.choice(possible_actions)
 
-    def _clear_tiles(self, t: tile.Tile):
-        vectors_to_clear = self._vectors_of(t)
-        for vector in vectors_to_clear:
-            self._tiles[vector.y][vector.x] = tile.EMPTY
+    def _clear_vectors(self, vectors: List[Optional[Vector]], t: tile.Tile):
+        # Only clear tiles that still hold t. An eaten fruit's tile is
+        # already part of the snake.
+        for vector in vectors:
+            if vector is not None and self.tile_at(vector) == t:
+                self._set_tile(self.cell_of(vector), tile.EMPTY)
 
     def _random_available_position(self) -> Vector:
-        t = None
-        rand_x, rand_y = 0, 0
-        while t is None or t != tile.EMPTY:
-            rand_x = random.randint(1, self._height - 1)
-            rand_y = random.randint(1, self._width - 1)
-            t = self._tiles[rand_x][rand_y]
-        return Vector(rand_x, rand_y)
+        cell = self._free[self._random.randrange(len(self._free))]
+        return self._cell_vectors[cell]
+
+    def free_tiles_count(self) -> int:
+        return len(self._free)
 
     def available_tiles_count(self) -> int:
         return (self._width - 2) * (self._height - 2)
@@ -155,5 +307,5 @@ class Environment:
 
     def tile_at(self, vector: Vector) -> Optional[tile.Tile]:
         if 0 <= vector.y < self._height and 0 <= vector.x < self._width:
-            return self._tiles[vector.y][vector.x]
+            return self._tiles[vector.y * self._width + vector.x]
         return None
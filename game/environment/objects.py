@@ -1,4 +1,5 @@
-from typing import List
+from collections import deque
+from typing import List, Deque
 
 from game.vector import Vector
 from game.environment import action as act
@@ -9,9 +10,11 @@ class Object:
         if vectors is None:
             vectors = []
         self._vectors = vectors
+        # Indexed copy of the vectors so membership checks are O(1)
+        self._occupied = set(vectors)
 
     def at_vector(self, vector: Vector) -> bool:
-        return vector in self._vectors
+        return vector in self._occupied
 
     def get_vectors(self) -> List[Vector]:
         return self._vectors
@@ -29,23 +32,34 @@ class Fruit(Object):
 
 
 class Snake(Object):
+    """
+    The snake is stored head first in a deque, so the head and tail can
+    both be updated in O(1).
+    """
     def __init__(self, vectors: List[Vector] = None,
                  action: act.Action = act.NONE):
         super().__init__(vectors)
+        self._vectors = deque(self._vectors)
         self.action = action
-        self._length = len(self._vectors)
 
     def head(self) -> Vector:
         return self._vectors[0]
 
     def tail(self) -> Vector:
-        return self._vectors[len(self._vectors) - 1]
+        return self._vectors[-1]
+
+    def get_vectors(self) -> Deque[Vector]:
+        """
+        :return: The snake's own deque, head first, which changes as it
+        moves. Copy it to keep or change it.
+        """
+        return self._vectors
 
     def length(self) -> int:
         return len(self._vectors)
 
     def __len__(self) -> int:
-        return self._length
+        return len(self._vectors)
 
     def move_to(self, vector: Vector) -> bool:
         if self.at_vector(vector):
@@ -53,10 +67,11 @@ class Snake(Object):
         diff = vector - self.head()
         if abs(diff.x) > 1 or abs(diff.y) > 1:
             return False
-        self._vectors.insert(0, vector)
-        self._length += 1
+        self._vectors.appendleft(vector)
+        self._occupied.add(vector)
         return True
 
     def remove_tail(self) -> Vector:
-        self._length -= 1
-        return self._vectors.pop()
+        vector = self._vectors.pop()
+        self._occupied.discard(vector)
+        return vector
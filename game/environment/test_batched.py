@@ -0,0 +1,96 @@
+from unittest import TestCase
+
+import numpy as np
+
+from game.environment import action as act, batched
+from game.vector import Vector
+
+
+class TestBatchedEnvironment(TestCase):
+    def setUp(self) -> None:
+        self._env = batched.BatchedEnvironment(64, 8, 6, seed=1)
+
+    def _place(self, board: int, vectors, fruit: Vector, a: act.Action):
+        # Put a known snake (head first) and fruit on a board
+        env = self._env
+        env.reset([board])
+        env.grid[board] = env.grid[board] * (env.grid[board] == batched.WALL)
+        cells = [v.x + v.y * 8 for v in reversed(vectors)]
+        env.body[board, :len(cells)] = cells
+        env.head_slot[board] = len(cells) - 1
+        env.length[board] = len(cells)
+        env.grid[board, cells] = batched.SNAKE
+        env.fruit[board] = fruit.x + fruit.y * 8
+        env.grid[board, env.fruit[board]] = batched.FRUIT
+        env.action[board] = act.ALL.index(a)
+
+    def test_reset(self):
+        env = self._env
+        self.assertTrue(env.alive.all())
+        self.assertTrue((env.length == 1).all())
+        self.assertTrue((env.grid == batched.SNAKE).sum(axis=1).all())
+        self.assertTrue(((env.grid == batched.FRUIT).sum(axis=1) == 1).all())
+        self.assertTrue((env.grid[np.arange(len(env)), env.heads()] ==
+                         batched.SNAKE).all())
+
+    def test_step(self):
+        env = self._env
+        self._place(0, [Vector(2, 2), Vector(1, 2)], Vector(4, 4),
+                    act.RIGHT)
+        self._place(1, [Vector(2, 2), Vector(1, 2)], Vector(3, 2),
+                    act.RIGHT)
+        self._place(2, [Vector(2, 2), Vector(1, 2)], Vector(4, 4),
+                    act.RIGHT)
+        self._place(3, [Vector(2, 2), Vector(2, 3)], Vector(4, 4),
+                    act.UP)
+        self._place(4, [Vector(2, 2), Vector(2, 3), Vector(1, 3),
+                        Vector(1, 2)], Vector(4, 4), act.UP)
+        actions = np.full(len(env), act.ALL.index(act.RIGHT))
+        actions[2] = act.ALL.index(act.LEFT)
+        actions[4] = act.ALL.index(act.LEFT)
+        reasons = env.step(actions)
+
+        self.assertEqual(reasons[0], batched.ALIVE)
+        self.assertEqual(env.snake_vectors(0), [Vector(3, 2), Vector(2, 2)])
+        self.assertEqual(env.tails()[0], 2 + 2 * 8)
+
+        self.assertEqual(reasons[1], batched.ALIVE)
+        self.assertEqual(
+            env.snake_vectors(1),
+            [Vector(3, 2), Vector(2, 2), Vector(1, 2)]
+        )
+        self.assertNotEqual(env.fruit[1], 3 + 2 * 8)
+        self.assertEqual(env.grid[1, env.fruit[1]], batched.FRUIT)
+
+        self.assertEqual(reasons[2], batched.ILLEGAL_BACKWARDS)
+        self.assertIs(batched.REASONS[reasons[2]],
+                      batched.death_reason.ILLEGAL_BACKWARDS)
+        self.assertEqual(reasons[3], batched.ALIVE)
+        self.assertEqual(reasons[4], batched.HIT_SNAKE)
+        self.assertFalse(env.alive[2] or env.alive[4])
+
+        # Dead boards don't move
+        before = env.grid[2].copy()
+        env.step(actions)
+        self.assertTrue((env.grid[2] == before).all())
+
+    def test_hit_wall(self):
+        env = self._env
+        self._place(0, [Vector(6, 2)], Vector(4, 4), act.RIGHT)
+        reasons = env.step(np.full(len(env), act.ALL.index(act.RIGHT)))
+        self.assertEqual(reasons[0], batched.HIT_WALL)
+        env.reset(~env.alive)
+        self.assertTrue(env.alive.all())
+
+    def test_won(self):
+        env = batched.BatchedEnvironment(2, 4, 3, seed=1)
+        # 2x1 playable area: a snake of 1 eats the only other cell
+        left, right = act.ALL.index(act.LEFT), act.ALL.index(act.RIGHT)
+        actions = np.where(
+            env.grid[[0, 1], env.heads() - 1] == batched.FRUIT, left, right
+        )
+        env.action[:] = actions
+        env.step(actions)
+        self.assertTrue(env.won.all())
+        self.assertFalse(env.alive.any())
+        self.assertTrue((env.reward() == 2).all())
@@ -0,0 +1,129 @@
+from unittest import TestCase
+from game.environment import action as act, tile, death_reason
+from game.environment.environment import Environment
+from game.vector import Vector
+
+
+class TestEnvironment(TestCase):
+    def setUp(self) -> None:
+        self._env = Environment(8, 6)
+        self._env.init_wall()
+        self._env.init_fruit()
+        self._env.init_snake()
+
+    def _empty_vectors(self):
+        return {
+            Vector(x, y) for y in range(6) for x in range(8)
+            if self._env.tile_at(Vector(x, y)) == tile.EMPTY
+        }
+
+    def test_init(self):
+        env = self._env
+        self.assertEqual(env.tile_at(env.fruit.get_vector()), tile.FRUIT)
+        self.assertEqual(env.tile_at(env.snake.head()), tile.SNAKE)
+        self.assertEqual(len(env.wall.get_vectors()), 2 * 8 + 2 * 4)
+        self.assertEqual(env.free_tiles_count(), 6 * 4 - 2)
+
+    def test_cells(self):
+        env = self._env
+        self.assertEqual(env.cells_count(), 48)
+        for cell in range(env.cells_count()):
+            vector = env.cell_vector(cell)
+            self.assertEqual(env.cell_of(vector), cell)
+            self.assertIs(env.tile_at_cell(cell), env.tile_at(vector))
+        self.assertIs(env.cell_vector(9), env.cell_vector(9))
+        self.assertEqual(env.cell_vector(9), Vector(1, 1))
+
+    def test_free_tiles_follow_steps(self):
+        env = self._env
+        for _ in range(200):
+            try:
+                a = env.random_action()
+            except IndexError:
+                # Boxed in, any move is fatal
+                a = env.snake.action
+            reason = env.step(a)
+            if reason or env.won():
+                env.init_snake()
+            self.assertEqual(
+                {env.cell_vector(c) for c in env._free},
+                self._empty_vectors()
+            )
+            self.assertEqual(len(env._free), env.free_tiles_count())
+
+    def test_spawn_on_nearly_full_board(self):
+        env = self._env
+        # Fill every tile but one with snake
+        for y in range(1, 5):
+            for x in range(1, 7):
+                env._set_tile(y * 8 + x, tile.SNAKE)
+        last = Vector(3, 3)
+        env._set_tile(env.cell_of(last), tile.EMPTY)
+        env.init_fruit()
+        self.assertEqual(env.fruit.get_vector(), last)
+        self.assertEqual(env.free_tiles_count(), 0)
+
+    def test_step_hit_wall(self):
+        env = self._env
+        env.snake.action = act.UP
+        while not env.step(act.UP):
+            if env.snake.head().y == 0:
+                self.fail('moved into the wall')
+        self.assertEqual(env.snake.head().y, 1)
+        self.assertIs(env.step(act.DOWN), death_reason.ILLEGAL_BACKWARDS)
+
+    def test_init_replaces_previous(self):
+        env = self._env
+        for _ in range(10):
+            env.init_fruit()
+            env.init_snake()
+        tiles = [
+            env.tile_at(Vector(x, y)) for y in range(6) for x in range(8)
+        ]
+        self.assertEqual(tiles.count(tile.FRUIT), 1)
+        self.assertEqual(tiles.count(tile.SNAKE), 1)
+        self.assertEqual(tiles.count(tile.WALL), 24)
+        env.init_wall()
+        self.assertEqual(env.free_tiles_count(), 6 * 4 - 2)
+
+    def test_seed(self):
+        def placements(seed):
+            env = Environment(8, 6, seed=seed)
+            env.init_wall()
+            result = []
+            for _ in range(10):
+                env.init_fruit()
+                env.init_snake()
+                result.append((env.fruit.get_vector(), env.snake.head(),
+                               env.snake.action.description))
+            return result
+
+        self.assertEqual(placements(1), placements(1))
+        self.assertNotEqual(placements(1), placements(2))
+
+    def test_place_snake(self):
+        env = Environment(8, 6)
+        env.init_wall()
+        env.init_snake(Vector(1, 1))
+        env.init_fruit(Vector(6, 4))
+        body = [Vector(3, 2), Vector(2, 2), Vector(2, 3), Vector(2, 4)]
+        env.place_snake(body, act.RIGHT)
+        self.assertEqual(list(env.snake.get_vectors()), body)
+        self.assertEqual(env.tile_at(Vector(1, 1)), tile.EMPTY)
+        self.assertEqual(env.free_tiles_count(), 6 * 4 - len(body) - 1)
+        self.assertIsNone(env.step(act.RIGHT))
+        self.assertEqual(env.snake.tail(), Vector(2, 3))
+        with self.assertRaises(Exception):
+            env.place_snake([Vector(0, 0)], act.RIGHT)
+
+    def test_save_and_load_state(self):
+        env = Environment(8, 6)
+        env.init_wall()
+        env.place_snake([Vector(3, 2), Vector(2, 2)], act.RIGHT)
+        env.init_fruit(Vector(6, 4))
+        state = env.save_state()
+        env.step(act.RIGHT)
+        env.load_state(state)
+        self.assertEqual(list(env.snake.get_vectors()),
+                         [Vector(3, 2), Vector(2, 2)])
+        self.assertEqual(env.tile_at(Vector(4, 2)), tile.EMPTY)
@@ -104,3 +104,12 @@ class TestSnake(TestCase):
             self.assertEqual(expected_v, v)
 
         self.assertRaises(IndexError, self._s.remove_tail)
+
+    def test_at_vector_after_move(self):
+        s = objects.Snake([Vector(5, 5), Vector(6, 5)])
+        self.assertTrue(s.move_to(Vector(4, 5)))
+        self.assertTrue(s.at_vector(Vector(4, 5)))
+        self.assertEqual(s.head(), Vector(4, 5))
+        self.assertEqual(s.remove_tail(), Vector(6, 5))
+        self.assertFalse(s.at_vector(Vector(6, 5)))
+        self.assertEqual(s.tail(), Vector(5, 5))
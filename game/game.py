@@ -1,34 +1,58 @@
 from __future__ import annotations
-from typing import List
+import time
+from typing import Type, Optional
 
 import pygame
-from pygame.surface import Surface
 from pygame.locals import QUIT, KEYDOWN
 
-from game import colour
 from game.solvers.abstract import AbstractModel
+from game.instrumentation import Instruments
+from game.renderer import Renderer
 from game.scores import ScoreLogger
-from game.screen_object import SnakeScreenObject, FruitScreenObject, \
-    WallScreenObject
-from game.vector import Vector
+from game.environment import death_reason
 from game.environment.environment import Environment
 
 
 class Game:
     def __init__(
-            self, game_model: AbstractModel, fps: int, horizontal_tiles: int,
-            vertical_tiles: int, screen_width: int, screen_height: int,
-            score_logger: ScoreLogger, font: str, screen_depth: int
+            self, game_model: Optional[AbstractModel], fps: int,
+            horizontal_tiles: int, vertical_tiles: int, screen_width: int,
+            screen_height: int, score_logger: Optional[ScoreLogger],
+            font: str, screen_depth: int,
+            renderer: Type[Renderer] = Renderer, tps: int = 0,
+            seed: Optional[int] = None,
+            environment: Optional[Environment] = None,
+            instruments: Optional[Instruments] = None
     ):
+        """
+        :param game_model: What plays the game, or None if a subclass steps
+        the environment itself
+        :param fps: Frames to draw per second
+        :param tps: Times to step the environment per second, independent
+        of fps. 0 steps as fast as possible, drawing only the latest state.
+        :param seed: Seed for the environment
+        :param environment: An environment that is already set up, rather
+        than a new one
+        :param instruments: Where to record how long each tick's phases
+        take, if anywhere
+        """
         self.clock = pygame.time.Clock()
         self.model = game_model
+        self.instruments = instruments
+        self.seed = seed
         self.fps = fps
+        self.tps = tps
+        self.ticks = 0
+        # Steps that are due but haven't been taken yet
+        self._owed_steps = 0.0
+        self._last_simulated = time.perf_counter()
+        self._last_status = self._last_simulated
+        self._last_status_ticks = 0
         self.screen = pygame.display.set_mode(
             (screen_width, screen_height,),
             0,
             screen_depth
         )
-        self.surface = pygame.Surface(self.screen.get_size())
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.horizontal_tiles = horizontal_tiles
@@ -36,112 +60,112 @@ class Game:
         self.tile_width = int(screen_width / horizontal_tiles)
         self.tile_height = int(screen_height / vertical_tiles)
         self._score_logger = score_logger
-        self._font = font
 
-        self.environment = Environment(
-            width=self.horizontal_tiles,
-            height=self.vertical_tiles
+        if environment is None:
+            environment = Environment(
+                width=self.horizontal_tiles,
+                height=self.vertical_tiles,
+                seed=seed
+            )
+            environment.init_wall()
+            environment.init_fruit()
+            environment.init_snake()
+        self.environment = environment
+
+        self.renderer = renderer(
+            self.screen, self.environment, self.tile_width, self.tile_height,
+            font
         )
-        self.environment.init_wall()
-        self.environment.init_fruit()
-        self.environment.init_snake()
-
-        self.screen_objects = []
-
-        normalised_wall_vectors = self._normalise_vectors(
-            self.environment.wall.get_vectors()
-        )
-        self.wall = WallScreenObject(self, normalised_wall_vectors)
-        self.screen_objects.append(self.wall)
-
-        normalised_fruit_vectors = self._normalise_vectors(
-            self.environment.fruit.get_vectors()
-        )
-        self.fruit = FruitScreenObject(self, normalised_fruit_vectors)
-        self.screen_objects.append(self.fruit)
-
-        normalised_snake_vectors = self._normalise_vectors(
-            self.environment.snake.get_vectors()
-        )
-        self.snake = SnakeScreenObject(self, normalised_snake_vectors)
-        self.screen_objects.append(self.snake)
+        pygame.display.update(self.renderer.draw_all())
 
     def tick(self) -> bool:
         continue_game = self._handle_user_input()
         if not continue_game:
             return False
-        action = self.model.next_action(self.environment)
-        reason = self.environment.step(action)
+        self._simulate()
+        self._update_status()
+        if self.instruments is None:
+            pygame.display.update(self.renderer.draw_changes())
+        else:
+            start = time.perf_counter_ns()
+            dirty = self.renderer.draw_changes()
+            drawn = time.perf_counter_ns()
+            pygame.display.update(dirty)
+            self.instruments.record('draw', drawn - start)
+            self.instruments.record('display', time.perf_counter_ns() - drawn)
+
+        self.clock.tick(self.fps)
+        return True
+
+    def _simulate(self):
+        # Step as many times as are due, but stop when the next frame
+        # should be drawn, and step at least once if tps is unbounded
+        now = time.perf_counter()
+        deadline = now + (1 / self.fps if self.fps else 0)
+        if self.tps:
+            self._owed_steps += (now - self._last_simulated) * self.tps
+        self._last_simulated = now
+        while not self.tps or self._owed_steps >= 1:
+            self._step()
+            if self.tps:
+                self._owed_steps -= 1
+            if time.perf_counter() >= deadline:
+                break
+        if self._owed_steps >= 1:
+            # The environment can't keep up, so don't try to catch up
+            self._owed_steps = 0.0
+
+    def _step(self):
+        if self.instruments is None:
+            action = self.model.next_action(self.environment)
+            reason = self.environment.step(action)
+        else:
+            start = time.perf_counter_ns()
+            action = self.model.next_action(self.environment)
+            acted = time.perf_counter_ns()
+            reason = self.environment.step(action)
+            self.instruments.record('next_action', acted - start)
+            self.instruments.record('step', time.perf_counter_ns() - acted)
+        self.ticks += 1
         if reason:
             print(f'died: {reason.reason}')
-            self.snake_died()
+            self.snake_died(reason)
         elif self.environment.won():
             print('won')
-            self.snake_died()
-        self._sync_screen_with_environment()
-        self._draw_screen()
-        self._display()
-
-        self.clock.tick(self.fps)
-        return True
+            self.snake_died(None)
+
+    def _update_status(self):
+        # Show the rates measured over roughly the last second
+        now = time.perf_counter()
+        elapsed = now - self._last_status
+        if elapsed < 1:
+            return
+        tps = (self.ticks - self._last_status_ticks) / elapsed
+        self.renderer.set_status(
+            f'{tps:.0f} tps {self.clock.get_fps():.0f} fps'
+        )
+        self._last_status = now
+        self._last_status_ticks = self.ticks
 
-    def snake_died(self):
+    def snake_died(self, reason: Optional[death_reason.DeathReason]):
         self._score_logger.log_score(
             self.model.short_name,
-            self.environment.reward()
+            self.environment.reward(),
+            reason=reason,
+            seed=self.seed,
+            width=self.environment.width,
+            height=self.environment.height
         )
         self.model.reset()
         self.environment.init_snake()
-
-    def draw_tile(self, surface: Surface, col: colour.Colour, vector: Vector):
-        rect = pygame.Rect(
-            (vector.x, vector.y),
-            (self.tile_width, self.tile_height)
-        )
-        pygame.draw.rect(surface, col, rect)
-
-    def _draw_screen(self):
-        self.surface.fill(colour.WHITE)
-        for game_object in self.screen_objects:
-            game_object.draw(self.surface)
-
-        font = pygame.font.SysFont(self._font, int(self.tile_height / 1.3))
-        score_text = font.render(
-            str(self.environment.reward()),
-            1,
-            colour.WHITE
-        )
-        score_text_rect = score_text.get_rect()
-        score_text_rect.center = (self.screen_width / 2, self.tile_height / 2)
-        self.surface.blit(score_text, score_text_rect)
-
-        self.screen.blit(self.surface, (0, 0))
-
-    def _sync_screen_with_environment(self):
-        self.fruit.set_vectors(self._normalise_vectors(
-            self.environment.fruit.get_vectors()
-        ))
-        self.snake.set_vectors(self._normalise_vectors(
-            self.environment.snake.get_vectors()
-        ))
-
-    def _display(self):
-        pygame.display.flip()
-        pygame.display.update()
-
-    def _normalise_vectors(self, vectors: List[Vector]) -> List[Vector]:
-        return list(map(lambda x: self._normalise_vector(x), vectors))
-
-    def _normalise_vector(self, vector: Vector) -> Vector:
-        return Vector(
-            vector.x * self.tile_width,
-            vector.y * self.tile_height
-        )
+        if reason is None:
+            # The last fruit was eaten without a new one appearing
+            self.environment.init_fruit()
 
     def _handle_user_input(self) -> bool:
         for event in pygame.event.get():
             if event.type == QUIT:
                 return False
-            elif event.type == KEYDOWN:
+            elif event.type == KEYDOWN and self.model is not None:
                 self.model.user_input(event)
         return True
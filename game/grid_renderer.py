@@ -0,0 +1,63 @@
+from typing import List
+
+import numpy as np
+import pygame
+from pygame.rect import Rect
+from pygame.surface import Surface
+
+from game.environment import tile
+from game.environment.environment import Environment
+from game.renderer import Renderer, TILE_COLOURS
+
+# Tiles in the order of their palette entries
+TILES = (tile.EMPTY, tile.WALL, tile.SNAKE, tile.FRUIT)
+
+
+class GridRenderer(Renderer):
+    """
+    Draws an environment by keeping one palette entry per cell in an
+    array, and pushing the whole array to the screen with a single blit and
+    scale. Drawing costs the same however long the snake is, which suits
+    very large boards where there are too many tiles to draw one by one.
+    """
+    def __init__(self, screen: Surface, environment: Environment,
+                 tile_width: int, tile_height: int, font: str):
+        super().__init__(screen, environment, tile_width, tile_height, font)
+        width, height = environment.width, environment.height
+        self._codes = {t: i for i, t in enumerate(TILES)}
+        self._palette = np.array(
+            [screen.map_rgb(TILE_COLOURS[t]) for t in TILES], dtype=np.uint32
+        )
+        # Indexed [x, y] as surfarray expects
+        self._grid = np.zeros((width, height), dtype=np.uint8)
+        self._cells = Surface((width, height), 0, screen)
+        # Scaled straight onto the part of the screen the board covers
+        self._board = screen.subsurface(
+            Rect(0, 0, width * tile_width, height * tile_height)
+        )
+
+    def draw_all(self) -> List[Rect]:
+        self._env.pop_changes()
+        self._screen.blit(self._background, (0, 0))
+        width = self._env.width
+        for cell in range(self._env.cells_count()):
+            self._grid[cell % width, cell // width] = \
+                self._codes[self._env.tile_at_cell(cell)]
+        return self._present()
+
+    def draw_changes(self) -> List[Rect]:
+        width = self._env.width
+        for cell in self._env.pop_changes():
+            self._grid[cell % width, cell // width] = \
+                self._codes[self._env.tile_at_cell(cell)]
+        return self._present()
+
+    def _present(self) -> List[Rect]:
+        pygame.surfarray.blit_array(self._cells, self._palette[self._grid])
+        pygame.transform.scale(
+            self._cells, self._board.get_size(), self._board
+        )
+        self._render_text()
+        for label in (self._score, self._status):
+            self._screen.blit(label.surface, label.rect)
+        return [self._screen.get_rect()]
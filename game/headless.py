@@ -0,0 +1,205 @@
+import random
+import time
+from typing import List, Optional
+
+from game.environment import death_reason
+from game.environment.environment import Environment
+from game.instrumentation import Instruments
+from game.replay import Replay, ReplayRecorder
+from game.replay_archive import ReplayArchive
+from game.scores import ScoreLogger
+from game.solvers.abstract import AbstractModel
+
+# A game ends as stalled once the snake has gone this many times the
+# number of free tiles without eating. Following a cycle over the whole
+# board always reaches the fruit well within that.
+STALL_FACTOR = 4
+
+
+class GameResult:
+    """
+    The outcome of a single game played by a HeadlessGame
+    """
+    def __init__(self, score: int, steps: int, won: bool,
+                 reason: Optional[death_reason.DeathReason],
+                 replay: Optional[Replay] = None, seed: Optional[int] = None):
+        """
+        :param seed: The seed the game was played from
+        """
+        self.score = score
+        self.steps = steps
+        self.won = won
+        self.reason = reason
+        self.replay = replay
+        self.seed = seed
+
+
+class RunStats:
+    def __init__(self):
+        self.ticks = 0
+        self.elapsed = 0.0
+        self.action_time = 0.0
+        self.results: List[GameResult] = []
+
+    @property
+    def games(self) -> int:
+        return len(self.results)
+
+    @property
+    def scores(self) -> List[int]:
+        return [r.score for r in self.results]
+
+    @property
+    def ticks_per_second(self) -> float:
+        if self.elapsed == 0:
+            return 0.0
+        return self.ticks / self.elapsed
+
+    def __str__(self):
+        scores = self.scores
+        mean = sum(scores) / len(scores) if scores else 0.0
+        return (
+            f'ticks: {self.ticks} '
+            f'ticks/sec: {self.ticks_per_second:.0f} '
+            f'games: {self.games} '
+            f'mean score: {mean:.2f} '
+            f'max score: {max(scores, default=0)}'
+        )
+
+
+class HeadlessGame:
+    """
+    Plays a model against an Environment as fast as possible.
+    Nothing is drawn, and pygame is never imported.
+    """
+    def __init__(
+            self, game_model: AbstractModel, horizontal_tiles: int,
+            vertical_tiles: int, score_logger: Optional[ScoreLogger] = None,
+            seed: Optional[int] = None, record: bool = False,
+            instruments: Optional[Instruments] = None,
+            stall_factor: Optional[int] = STALL_FACTOR,
+            replay_archive: Optional[ReplayArchive] = None
+    ):
+        """
+        :param record: Keep a replay of every game in its result
+        :param instruments: Where to record how long each tick's phases
+        take, if anywhere
+        :param stall_factor: End a game once the snake has gone this many
+        times the free tiles without eating, or never if None
+        :param replay_archive: Where to append a replay of each game as
+        it ends, if anywhere
+        """
+        self.model = game_model
+        self.instruments = instruments
+        self.seed = seed
+        # Every game is played from its own seed, drawn from this
+        self._game_seeds = random.Random(seed)
+        # The seed of the game being played
+        self.game_seed = 0
+        self._record = record
+        self._replay_archive = replay_archive
+        self._recorder = None
+        if record or replay_archive is not None:
+            self._recorder = ReplayRecorder()
+        self._score_logger = score_logger
+        self.stats = RunStats()
+        self._steps = 0
+        self._stall_factor = stall_factor
+        self._steps_since_fruit = 0
+        self._stall_limit: Optional[int] = None
+        self._score = 0
+        self._game_start = time.perf_counter()
+
+        self.environment = Environment(
+            width=horizontal_tiles,
+            height=vertical_tiles,
+            seed=seed
+        )
+        self.environment.init_wall()
+        self._start_game()
+
+    def _start_game(self):
+        # Each game is set up and played from its own seed alone, so it
+        # can be played again from the seed that was logged
+        self.game_seed = self._game_seeds.getrandbits(63)
+        self.environment.new_game(self.game_seed)
+        if self._recorder:
+            self._recorder.start(self.environment, self.game_seed)
+        self._ate()
+
+    def _ate(self):
+        self._score = self.environment.reward()
+        self._steps_since_fruit = 0
+        if self._stall_factor is not None:
+            self._stall_limit = self._stall_factor * (
+                self.environment.free_tiles_count() + 1
+            )
+
+    def tick(self):
+        start = time.perf_counter_ns()
+        action = self.model.next_action(self.environment)
+        acted = time.perf_counter_ns()
+        self.stats.action_time += (acted - start) / 1e9
+        reason = self.environment.step(action)
+        if self.instruments is not None:
+            self.instruments.record('next_action', acted - start)
+            self.instruments.record('step', time.perf_counter_ns() - acted)
+        self.stats.ticks += 1
+        if reason:
+            self.snake_died(reason)
+            return
+        self._steps += 1
+        self._steps_since_fruit += 1
+        if self.environment.won():
+            self.snake_died(None)
+        elif self.environment.reward() > self._score:
+            self._ate()
+        elif self._stall_limit is not None and \
+                self._steps_since_fruit >= self._stall_limit:
+            self.snake_died(death_reason.STALLED)
+
+    def run(self, max_ticks: Optional[int] = None,
+            max_games: Optional[int] = None) -> RunStats:
+        """
+        Play until either limit is reached. With no limits this plays
+        until interrupted.
+        """
+        start = time.perf_counter()
+        try:
+            while True:
+                if max_ticks is not None and self.stats.ticks >= max_ticks:
+                    break
+                if max_games is not None and self.stats.games >= max_games:
+                    break
+                self.tick()
+        finally:
+            self.stats.elapsed += time.perf_counter() - start
+        return self.stats
+
+    def snake_died(self, reason: Optional[death_reason.DeathReason]):
+        replay = self._recorder.finish() if self._recorder else None
+        result = GameResult(
+            score=self.environment.reward(),
+            steps=self._steps,
+            won=reason is None,
+            reason=reason,
+            replay=replay if self._record else None,
+            seed=self.game_seed
+        )
+        self.stats.results.append(result)
+        if self._replay_archive is not None:
+            self._replay_archive.append(
+                self.model.short_name, result.score, reason, replay
+            )
+        if self._score_logger:
+            now = time.perf_counter()
+            self._score_logger.log_score(
+                self.model.short_name, result.score, steps=result.steps,
+                reason=reason, seed=result.seed,
+                duration=now - self._game_start,
+                width=self.environment.width, height=self.environment.height
+            )
+            self._game_start = now
+        self._steps = 0
+        self.model.reset()
+        self._start_game()
@@ -0,0 +1,82 @@
+from typing import Dict, List
+
+# Values below this are counted exactly. Above it, each power of two is
+# split into SUB_BUCKETS // 2 buckets, so counts are within about 3%.
+SUB_BUCKETS = 64
+_SUB_BITS = SUB_BUCKETS.bit_length() - 1
+_HALF = SUB_BUCKETS // 2
+
+
+class Histogram:
+    """
+    Counts of non-negative integers in log-linear buckets, in the style of
+    an HDR histogram. Recording a value is O(1) and never allocates after
+    the buckets for its magnitude exist.
+    """
+    def __init__(self):
+        self._counts: List[int] = [0] * SUB_BUCKETS
+        self.count = 0
+        self.max = 0
+
+    def record(self, value: int):
+        if value < SUB_BUCKETS:
+            index = value
+        else:
+            shift = value.bit_length() - _SUB_BITS
+            index = SUB_BUCKETS + (shift - 1) * _HALF + \
+                (value >> shift) - _HALF
+            if index >= len(self._counts):
+                self._counts.extend([0] * (index + 1 - len(self._counts)))
+        self._counts[index] += 1
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    @staticmethod
+    def _highest_in(index: int) -> int:
+        if index < SUB_BUCKETS:
+            return index
+        shift, sub = divmod(index - SUB_BUCKETS, _HALF)
+        shift += 1
+        return ((sub + _HALF + 1) << shift) - 1
+
+    def percentile(self, p: float) -> int:
+        """
+        :return: The highest value in the bucket holding the pth percentile,
+        which is never more than the largest value recorded
+        """
+        rank = p / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if count and seen >= rank:
+                return min(self._highest_in(index), self.max)
+        return self.max
+
+
+class Instruments:
+    """
+    Timings of each phase of a tick, in nanoseconds.
+    """
+    def __init__(self):
+        self.histograms: Dict[str, Histogram] = {}
+
+    def record(self, phase: str, nanoseconds: int):
+        histogram = self.histograms.get(phase)
+        if histogram is None:
+            histogram = self.histograms[phase] = Histogram()
+        histogram.record(nanoseconds)
+
+    def report(self, counters: Dict[str, int]) -> str:
+        lines = [
+            f'{"phase":<16} {"count":>10} {"p50 us":>10} {"p99 us":>10} '
+            f'{"max us":>10}'
+        ]
+        for phase, h in self.histograms.items():
+            lines.append(
+                f'{phase:<16} {h.count:>10} {h.percentile(50) / 1000:>10.1f} '
+                f'{h.percentile(99) / 1000:>10.1f} {h.max / 1000:>10.1f}'
+            )
+        for name, count in counters.items():
+            lines.append(f'{name}: {count}')
+        return '\n'.join(lines)
@@ -0,0 +1,149 @@
+from typing import List, Optional, Tuple
+
+import pygame
+from pygame.rect import Rect
+from pygame.surface import Surface
+
+from game import colour
+from game.environment import tile
+from game.environment.environment import Environment
+
+TILE_COLOURS = {
+    tile.EMPTY: colour.WHITE,
+    tile.WALL: colour.BLACK,
+    tile.SNAKE: colour.GREEN,
+    tile.FRUIT: colour.RED,
+}
+
+
+class Label:
+    """
+    A line of text that is only rendered again when it changes.
+    """
+    def __init__(self, font: pygame.font.Font, **position: Tuple[int, int]):
+        self._font = font
+        # Where to put the text, e.g. center=(x, y)
+        self._position = position
+        self._text: Optional[str] = None
+        self.surface: Optional[Surface] = None
+        self.rect: Optional[Rect] = None
+
+    def set_text(self, text: str) -> bool:
+        """
+        :return: True if the text changed and was rendered
+        """
+        if text == self._text:
+            return False
+        self._text = text
+        self.surface = self._font.render(text, True, colour.WHITE)
+        self.rect = self.surface.get_rect(**self._position)
+        return True
+
+    def forget(self):
+        """
+        Render the text again when it is next set, even if it's the same.
+        """
+        self._text = None
+
+
+class Renderer:
+    """
+    Draws an environment onto the screen a tile at a time. The whole board
+    is drawn once, after which only the cells that the environment reports
+    as changed are redrawn, and only their rects are pushed to the display.
+    """
+    def __init__(self, screen: Surface, environment: Environment,
+                 tile_width: int, tile_height: int, font: str):
+        self._screen = screen
+        self._env = environment
+        self._tile_width = tile_width
+        self._tile_height = tile_height
+        self._score = Label(
+            pygame.font.SysFont(font, int(tile_height / 1.3)),
+            center=(screen.get_width() // 2, tile_height // 2)
+        )
+        self._status = Label(
+            pygame.font.SysFont(font, int(tile_height / 2)),
+            midleft=(tile_width // 4, tile_height // 2)
+        )
+        self._status_text = ''
+        # The board as it is when empty, which is what sits behind the text
+        self._background = Surface(screen.get_size())
+        self._background.fill(colour.WHITE)
+        for vector in environment.wall.get_vectors():
+            self._background.fill(colour.BLACK, self._cell_rect(
+                environment.cell_of(vector)
+            ))
+        environment.track_changes()
+
+    def _cell_rect(self, cell: int) -> Rect:
+        vector = self._env.cell_vector(cell)
+        return Rect(
+            vector.x * self._tile_width, vector.y * self._tile_height,
+            self._tile_width, self._tile_height
+        )
+
+    def draw_all(self) -> List[Rect]:
+        """
+        Draw every tile, the score and the status.
+
+        :return: The area of the screen that has been drawn on
+        """
+        self._env.pop_changes()
+        self._screen.blit(self._background, (0, 0))
+        for cell in range(self._env.cells_count()):
+            t = self._env.tile_at_cell(cell)
+            if t != tile.EMPTY and t != tile.WALL:
+                self._screen.fill(TILE_COLOURS[t], self._cell_rect(cell))
+        for label in (self._score, self._status):
+            label.forget()
+        self._draw_text()
+        return [self._screen.get_rect()]
+
+    def draw_changes(self) -> List[Rect]:
+        """
+        Redraw the tiles that have changed since the last draw, and the
+        score and status if they have changed.
+
+        :return: The rects that have been drawn on
+        """
+        dirty = []
+        for cell in set(self._env.pop_changes()):
+            rect = self._cell_rect(cell)
+            self._screen.fill(
+                TILE_COLOURS[self._env.tile_at_cell(cell)], rect
+            )
+            dirty.append(rect)
+        dirty.extend(self._draw_text())
+        return dirty
+
+    def set_status(self, text: str):
+        """
+        Show text in the top left corner, from the next draw.
+        """
+        self._status_text = text
+
+    def _render_text(self) -> List[Label]:
+        """
+        :return: The labels whose text has changed and been rendered
+        """
+        changed = []
+        if self._score.set_text(str(self._env.reward())):
+            changed.append(self._score)
+        if self._status.set_text(self._status_text):
+            changed.append(self._status)
+        return changed
+
+    def _draw_text(self) -> List[Rect]:
+        old_rects = [self._score.rect, self._status.rect]
+        changed = self._render_text()
+        if not changed:
+            return []
+        # The text is drawn over the top wall, so put the wall back first
+        for rect in old_rects:
+            if rect is not None:
+                self._screen.blit(self._background, rect, rect)
+        for label in (self._score, self._status):
+            self._screen.blit(label.surface, label.rect)
+        return [r for r in old_rects if r is not None] + \
+            [label.rect for label in changed]
@@ -0,0 +1,230 @@
+import argparse
+import struct
+from typing import Optional, List, Dict, Iterator
+
+from game.environment import action as act, death_reason
+from game.environment.environment import Environment
+from game.vector import Vector
+
+# Magic, width, height, seed, fruit cell, head cell, first action,
+# number of moves, and whether the last move is stored here rather than
+# with the others and the x and y it moved by, followed by the moves
+HEADER = struct.Struct('<4sHHqIIBIBii')
+MAGIC = b'SNR2'
+# Moves are stored as their index in act.ALL, four to a byte
+MOVES_PER_BYTE = 4
+# Ticks between the states that playback keeps so it can seek quickly
+KEYFRAME_INTERVAL = 1024
+
+_ACTION_INDEXES: Dict[Vector, int] = {
+    a.vector: i for i, a in enumerate(act.ALL)
+}
+
+
+class Replay:
+    """
+    One game, stored as where it started and the moves that were made.
+    Everything else, including where each fruit appeared, follows from
+    replaying the moves in an environment reseeded with the game's seed.
+    """
+    def __init__(self, width: int, height: int, seed: int, fruit: int,
+                 head: int, action: int, moves: bytearray, length: int,
+                 last: Optional[act.Action] = None):
+        """
+        :param last: A final move that isn't in act.ALL, and so can't be
+        stored in two bits. Any such move ends the game.
+        """
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.fruit = fruit
+        self.head = head
+        self.action = action
+        self.moves = moves
+        self.length = length
+        self.last = last
+
+    def __len__(self) -> int:
+        return self.length
+
+    def move(self, tick: int) -> act.Action:
+        if self.last is not None and tick == self.length - 1:
+            return self.last
+        byte = self.moves[tick // MOVES_PER_BYTE]
+        return act.ALL[(byte >> (tick % MOVES_PER_BYTE * 2)) & 3]
+
+    def actions(self) -> Iterator[act.Action]:
+        for tick in range(self.length):
+            yield self.move(tick)
+
+    def to_bytes(self) -> bytes:
+        last = Vector(0, 0) if self.last is None else self.last.vector
+        return HEADER.pack(
+            MAGIC, self.width, self.height, self.seed, self.fruit,
+            self.head, self.action, self.length, self.last is not None,
+            last.x, last.y
+        ) + bytes(self.moves)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'Replay':
+        magic, width, height, seed, fruit, head, action, length, \
+            has_last, last_x, last_y = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise Exception('not a replay')
+        last = None
+        if has_last:
+            last = act.Action(Vector(last_x, last_y), 'illegal move')
+        moves_size = -(-(length - has_last) // MOVES_PER_BYTE)
+        moves = bytearray(data[HEADER.size:HEADER.size + moves_size])
+        return Replay(width, height, seed, fruit, head, action, moves, length,
+                      last)
+
+    def save(self, path: str):
+        with open(path, 'wb') as fh:
+            fh.write(self.to_bytes())
+
+    @staticmethod
+    def load(path: str) -> 'Replay':
+        with open(path, 'rb') as fh:
+            return Replay.from_bytes(fh.read())
+
+
+class ReplayRecorder:
+    """
+    Records the moves an environment is told to make, from when start is
+    called until finish.
+    """
+    def __init__(self):
+        self._environment: Optional[Environment] = None
+        self._replay: Optional[Replay] = None
+
+    def start(self, environment: Environment, seed: int):
+        """
+        Reseed the environment and start recording a game from its current
+        state.
+        """
+        environment.reseed(seed)
+        environment.recorder = self
+        self._environment = environment
+        self._replay = Replay(
+            environment.width, environment.height, seed,
+            environment.cell_of(environment.fruit.get_vector()),
+            environment.cell_of(environment.snake.head()),
+            _ACTION_INDEXES[environment.snake.action.vector],
+            bytearray(), 0
+        )
+
+    def record(self, action: act.Action):
+        replay = self._replay
+        if replay.last is not None:
+            raise Exception('the recorded game has already ended')
+        index = _ACTION_INDEXES.get(action.vector)
+        if index is None:
+            # The environment ends the game on any other move, so it can
+            # only be the last one
+            replay.last = action
+            replay.length += 1
+            return
+        shift = replay.length % MOVES_PER_BYTE * 2
+        if shift == 0:
+            replay.moves.append(index)
+        else:
+            replay.moves[-1] |= index << shift
+        replay.length += 1
+
+    def finish(self) -> Replay:
+        replay = self._replay
+        self._environment.recorder = None
+        self._environment = None
+        self._replay = None
+        return replay
+
+
+class ReplayPlayer:
+    """
+    Plays a replay back in an environment. The environment's state is kept
+    every KEYFRAME_INTERVAL ticks as they are played, so seeking only
+    replays the moves since the nearest one.
+    """
+    def __init__(self, replay: Replay):
+        self.replay = replay
+        self.environment = Environment(replay.width, replay.height)
+        env = self.environment
+        env.init_wall()
+        env.init_fruit(env.cell_vector(replay.fruit))
+        env.init_snake(
+            env.cell_vector(replay.head), act.ALL[replay.action]
+        )
+        env.reseed(replay.seed)
+        self.tick = 0
+        self.reason: Optional[death_reason.DeathReason] = None
+        self._keyframes: List[tuple] = [env.save_state()]
+
+    def finished(self) -> bool:
+        return self.tick >= len(self.replay)
+
+    def step(self) -> Optional[death_reason.DeathReason]:
+        """
+        Make the next move.
+        """
+        reason = self.environment.step(self.replay.move(self.tick))
+        self.tick += 1
+        if reason is not None:
+            self.reason = reason
+        if self.tick % KEYFRAME_INTERVAL == 0 and \
+                self.tick // KEYFRAME_INTERVAL == len(self._keyframes):
+            self._keyframes.append(self.environment.save_state())
+        return reason
+
+    def seek(self, tick: int):
+        """
+        Put the environment in its state after tick moves.
+        """
+        tick = min(tick, len(self.replay))
+        keyframe = min(tick // KEYFRAME_INTERVAL, len(self._keyframes) - 1)
+        if tick < self.tick or keyframe * KEYFRAME_INTERVAL > self.tick:
+            self.environment.load_state(self._keyframes[keyframe])
+            self.tick = keyframe * KEYFRAME_INTERVAL
+            self.reason = None
+        while self.tick < tick:
+            self.step()
+
+
+def board_text(environment: Environment) -> str:
+    return '\n'.join(
+        ''.join(
+            environment.tile_at_cell(y * environment.width + x).char
+            for x in range(environment.width)
+        )
+        for y in range(environment.height)
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play back a replay")
+    parser.add_argument("path", help="Replay file")
+    parser.add_argument("--tick", type=int, default=None,
+                        help="Show the board after this many moves, "
+                             "rather than the end of the game")
+    parser.add_argument("--view", action="store_true",
+                        help="Watch the replay in a window")
+    parser.add_argument("-fps", "--fps", type=int, default=60,
+                        help="Frames drawn per second when watching")
+    parser.add_argument("-tps", "--tps", type=int, default=10,
+                        help="Moves per second when watching, or 0 for as "
+                             "fast as possible")
+    args = parser.parse_args()
+
+    r = Replay.load(args.path)
+    if args.view:
+        from game.replay_view import play_back
+        play_back(r, args.fps, args.tps)
+    else:
+        p = ReplayPlayer(r)
+        p.seek(len(r) if args.tick is None else args.tick)
+        print(board_text(p.environment))
+        print(f'tick: {p.tick}/{len(r)} score: {p.environment.reward()}')
+        if p.reason is not None:
+            print(f'died: {p.reason.reason}')
+        elif p.environment.won():
+            print('won')
@@ -0,0 +1,237 @@
+import argparse
+import mmap
+import os
+import struct
+from typing import Optional, Iterator, BinaryIO
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, where writers aren't locked out
+    fcntl = None
+
+from game.environment import death_reason
+from game.replay import Replay
+
+# Offset and length of the replay in the data file, solver, score and
+# death reason
+INDEX_ENTRY = struct.Struct('<QI32sIB')
+
+
+class ArchiveEntry:
+    """
+    What the index says about one episode in a ReplayArchive
+    """
+    def __init__(self, episode: int, offset: int, length: int, solver: str,
+                 score: int, reason: Optional[death_reason.DeathReason]):
+        self.episode = episode
+        self.offset = offset
+        self.length = length
+        self.solver = solver
+        self.score = score
+        self.reason = reason
+
+
+class ReplayArchive:
+    """
+    Replays appended one after another to a data file, with a fixed size
+    entry per replay in an index file. An episode's entry is found by its
+    number alone, and the index can be scanned through mmap without
+    reading any replays.
+
+    Only one ReplayArchive may append to an archive at a time. The first
+    append opens both files until close, and where fcntl is available
+    locks the index, so a second writer fails rather than corrupting it.
+    Any number of readers can read while it is written.
+    """
+    def __init__(self, path: str):
+        self._data_path = f'{path}.replays'
+        self._index_path = f'{path}.index'
+        self._data: Optional[mmap.mmap] = None
+        self._index: Optional[mmap.mmap] = None
+        # Open while appending, with where the next replay goes
+        self._data_file: Optional[BinaryIO] = None
+        self._index_file: Optional[BinaryIO] = None
+        self._next_offset = 0
+        self._next_episode = 0
+
+    def _open_for_writing(self):
+        dir_path = os.path.dirname(self._data_path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        index_file = open(self._index_path, 'ab')
+        if fcntl is not None:
+            try:
+                fcntl.flock(index_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                index_file.close()
+                raise Exception(
+                    f'{self._index_path} is being written by another '
+                    f'ReplayArchive'
+                )
+        # Drop an entry left partly written by a writer that was killed
+        self._next_episode = index_file.tell() // INDEX_ENTRY.size
+        index_file.truncate(self._next_episode * INDEX_ENTRY.size)
+        index_file.seek(0, os.SEEK_END)
+        self._index_file = index_file
+        self._data_file = open(self._data_path, 'ab')
+        self._next_offset = self._data_file.tell()
+
+    def append(self, solver: str, score: int,
+               reason: Optional[death_reason.DeathReason],
+               replay: Replay) -> int:
+        """
+        :return: The new episode's number
+        """
+        solver_bytes = solver.encode()
+        if len(solver_bytes) > 32:
+            raise Exception(f'solver name {solver} is too long')
+        data = replay.to_bytes()
+        if self._index_file is None:
+            self._open_for_writing()
+        # The replay is written before its index entry, so the index never
+        # refers to a replay that isn't there
+        self._data_file.write(data)
+        self._data_file.flush()
+        self._index_file.write(INDEX_ENTRY.pack(
+            self._next_offset, len(data), solver_bytes, score,
+            death_reason.to_code(reason)
+        ))
+        self._index_file.flush()
+        episode = self._next_episode
+        self._next_offset += len(data)
+        self._next_episode += 1
+        return episode
+
+    def _map(self, path: str, mapped: Optional[mmap.mmap]
+             ) -> Optional[mmap.mmap]:
+        # Map the file again if it has grown since it was last mapped
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return None
+        if mapped is not None and len(mapped) == size:
+            return mapped
+        if mapped is not None:
+            try:
+                mapped.close()
+            except BufferError:
+                # Still being read by entries, so it's left for the
+                # garbage collector to close
+                pass
+        if size == 0:
+            return None
+        with open(path, 'rb') as fh:
+            return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        self._index = self._map(self._index_path, self._index)
+        if self._index is None:
+            return 0
+        return len(self._index) // INDEX_ENTRY.size
+
+    def entry(self, episode: int) -> ArchiveEntry:
+        if not 0 <= episode < len(self):
+            raise IndexError(f'no episode {episode}')
+        return self._unpack(
+            episode,
+            INDEX_ENTRY.unpack_from(self._index, episode * INDEX_ENTRY.size)
+        )
+
+    def entries(self) -> Iterator[ArchiveEntry]:
+        count = len(self)
+        if count == 0:
+            return
+        view = memoryview(self._index)[:count * INDEX_ENTRY.size]
+        try:
+            for episode, values in enumerate(INDEX_ENTRY.iter_unpack(view)):
+                yield self._unpack(episode, values)
+        finally:
+            view.release()
+
+    @staticmethod
+    def _unpack(episode: int, values: tuple) -> ArchiveEntry:
+        offset, length, solver, score, reason = values
+        return ArchiveEntry(
+            episode, offset, length, solver.rstrip(b'\0').decode(), score,
+            death_reason.from_code(reason)
+        )
+
+    def find(self, solver: Optional[str] = None,
+             reason: Optional[death_reason.DeathReason] = None,
+             won: Optional[bool] = None,
+             min_score: Optional[int] = None) -> Iterator[ArchiveEntry]:
+        """
+        :return: The entries of every episode matching all of the given
+        conditions, found from the index alone
+        """
+        for entry in self.entries():
+            if solver is not None and entry.solver != solver:
+                continue
+            if reason is not None and entry.reason is not reason:
+                continue
+            if won is not None and (entry.reason is None) != won:
+                continue
+            if min_score is not None and entry.score < min_score:
+                continue
+            yield entry
+
+    def replay(self, episode: int) -> Replay:
+        entry = self.entry(episode)
+        self._data = self._map(self._data_path, self._data)
+        return Replay.from_bytes(
+            self._data[entry.offset:entry.offset + entry.length]
+        )
+
+    def close(self):
+        for mapped in (self._data, self._index):
+            if mapped is not None:
+                mapped.close()
+        self._data = self._index = None
+        # Closing the index also releases the lock on it
+        for fh in (self._data_file, self._index_file):
+            if fh is not None:
+                fh.close()
+        self._data_file = self._index_file = None
+
+
+# Death reasons by the name given on the command line
+REASONS = {
+    name.lower(): getattr(death_reason, name) for name in (
+        'ILLEGAL_BACKWARDS', 'ILLEGAL_TOO_FAR', 'ILLEGAL_DIAGONAL',
+        'HIT_SNAKE', 'HIT_WALL', 'STALLED',
+    )
+}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Find episodes in a replay archive"
+    )
+    parser.add_argument("path", help="Archive, without the file extension")
+    parser.add_argument("--solver", default=None,
+                        help="Only episodes played by this solver")
+    parser.add_argument("--reason", choices=sorted(REASONS) + ['won'],
+                        default=None,
+                        help="Only episodes that ended this way")
+    parser.add_argument("--min-score", type=int, default=None,
+                        help="Only episodes that scored at least this much")
+    parser.add_argument("--extract", default=None,
+                        help="Save the matching replays to this directory")
+    args = parser.parse_args()
+
+    archive = ReplayArchive(args.path)
+    matches = archive.find(
+        solver=args.solver,
+        reason=REASONS.get(args.reason),
+        won=True if args.reason == 'won' else None,
+        min_score=args.min_score
+    )
+    for e in matches:
+        ending = 'won' if e.reason is None else e.reason.reason
+        print(f'{e.episode:>10} {e.solver:<30} {e.score:>6} {ending}')
+        if args.extract is not None:
+            os.makedirs(args.extract, exist_ok=True)
+            archive.replay(e.episode).save(
+                os.path.join(args.extract, f'{e.episode}.replay')
+            )
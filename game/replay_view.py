@@ -0,0 +1,51 @@
+import pygame
+
+from game import constants
+from game.game import Game
+from game.replay import Replay, ReplayPlayer
+
+
+class ReplayGame(Game):
+    """
+    Shows a replay being played back, instead of a model playing.
+    """
+    def __init__(self, player: ReplayPlayer, fps: int, tps: int):
+        self.player = player
+        super().__init__(
+            game_model=None,
+            fps=fps,
+            tps=tps,
+            horizontal_tiles=player.replay.width,
+            vertical_tiles=player.replay.height,
+            screen_width=constants.SCREEN_WIDTH,
+            screen_height=constants.SCREEN_HEIGHT,
+            score_logger=None,
+            font=constants.FONT,
+            screen_depth=constants.SCREEN_DEPTH,
+            environment=player.environment
+        )
+
+    def _simulate(self):
+        if self.player.finished():
+            return
+        super()._simulate()
+
+    def _step(self):
+        # Leave the end of the game on screen until the window is closed
+        if self.player.finished():
+            return
+        reason = self.player.step()
+        self.ticks += 1
+        if reason:
+            print(f'died: {reason.reason}')
+        elif self.environment.won():
+            print('won')
+
+
+def play_back(replay: Replay, fps: int, tps: int):
+    pygame.init()
+    pygame.display.set_caption(constants.NAME)
+    g = ReplayGame(ReplayPlayer(replay), fps, tps)
+    while g.tick():
+        pass
+    pygame.quit()
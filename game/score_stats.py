@@ -0,0 +1,191 @@
+import argparse
+import math
+import os
+import time
+from typing import Dict, Iterator, Tuple, List, Optional
+
+from game.score_store import percentile
+from game.scores import ScoreRecord, RECORD
+
+# Bytes to read from a log at a time
+CHUNK_SIZE = RECORD.size * 4096
+
+
+class RunningStats:
+    """
+    Count, mean and variance of a stream of values, updated one value at a
+    time with Welford's method.
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def variance(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return self._m2 / (self.count - 1)
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class SolverStats:
+    """
+    Running statistics of one solver's games. Scores are whole numbers no
+    bigger than the board, so counting games by score gives exact
+    percentiles in memory bounded by the board size, however many games
+    are added.
+    """
+    def __init__(self, solver: str):
+        self.solver = solver
+        self.scores = RunningStats()
+        self.steps = RunningStats()
+        self.wins = 0
+        self._score_counts: Dict[int, int] = {}
+
+    def add(self, record: ScoreRecord, detailed: bool):
+        """
+        :param detailed: Whether the record has steps and a death reason,
+        which only the binary format stores
+        """
+        self.scores.add(record.score)
+        self._score_counts[record.score] = \
+            self._score_counts.get(record.score, 0) + 1
+        if detailed:
+            self.steps.add(record.steps)
+            if record.reason is None:
+                self.wins += 1
+
+    def percentile(self, p: float) -> int:
+        return percentile(sorted(self._score_counts.items()), p)
+
+
+class LogFollower:
+    """
+    Reads the scores that ScoreLogger has written to a directory of CSV
+    and binary logs, a chunk at a time. Each call to read picks up where
+    the last left off, so logs can be followed while they're written.
+    """
+    def __init__(self, base_path: str):
+        self._base_path = base_path
+        # How far into each log has been read, and any partial line or
+        # record at the end of what was read
+        self._offsets: Dict[str, int] = {}
+        self._remainders: Dict[str, bytes] = {}
+
+    def read(self) -> Iterator[Tuple[str, ScoreRecord, bool]]:
+        """
+        :return: The solver, record and whether the record is detailed, of
+        every complete score written since the last read
+        """
+        for file_name in sorted(os.listdir(self._base_path)):
+            solver, extension = os.path.splitext(file_name)
+            if extension == '.csv':
+                parse, detailed = self._parse_csv, False
+            elif extension == '.scores':
+                parse, detailed = self._parse_binary, True
+            else:
+                continue
+            path = os.path.join(self._base_path, file_name)
+            for data in self._read_new(path):
+                for record in parse(path, data):
+                    yield solver, record, detailed
+
+    def _read_new(self, path: str) -> Iterator[bytes]:
+        with open(path, 'rb') as fh:
+            fh.seek(self._offsets.get(path, 0))
+            while True:
+                data = fh.read(CHUNK_SIZE)
+                if not data:
+                    break
+                self._offsets[path] = fh.tell()
+                yield self._remainders.pop(path, b'') + data
+
+    def _parse_csv(self, path: str, data: bytes) -> Iterator[ScoreRecord]:
+        end = data.rfind(b'\n') + 1
+        self._remainders[path] = data[end:]
+        for line in data[:end].split():
+            yield ScoreRecord(int(line))
+
+    def _parse_binary(self, path: str, data: bytes) -> Iterator[ScoreRecord]:
+        end = len(data) - len(data) % RECORD.size
+        self._remainders[path] = data[end:]
+        for offset in range(0, end, RECORD.size):
+            yield ScoreRecord.unpack(data[offset:offset + RECORD.size])
+
+
+def format_stats(stats: List[SolverStats], percentiles: List[float]) -> str:
+    lines = [
+        f'{"solver":<30} {"games":>9} {"mean":>8} {"stdev":>8} {"min":>5} '
+        + ' '.join(f'{f"p{p:g}":>5}' for p in percentiles) +
+        f' {"max":>5} {"win %":>6} {"steps":>9}'
+    ]
+    for s in stats:
+        detailed = s.steps.count > 0
+        win_rate = f'{s.wins / s.steps.count * 100:.1f}' if detailed else '-'
+        steps = f'{s.steps.mean:.1f}' if detailed else '-'
+        lines.append(
+            f'{s.solver:<30} {s.scores.count:>9} {s.scores.mean:>8.2f} '
+            f'{s.scores.stdev:>8.2f} {s.scores.min:>5} ' +
+            ' '.join(f'{s.percentile(p):>5}' for p in percentiles) +
+            f' {s.scores.max:>5} {win_rate:>6} {steps:>9}'
+        )
+    return '\n'.join(lines)
+
+
+def summarise(follower: LogFollower, stats: Dict[str, SolverStats]):
+    for solver, record, detailed in follower.read():
+        if solver not in stats:
+            stats[solver] = SolverStats(solver)
+        stats[solver].add(record, detailed)
+
+
+if __name__ == '__main__':
+    from game import constants
+
+    parser = argparse.ArgumentParser(
+        description="Summarise score logs without loading them into memory"
+    )
+    parser.add_argument("--path", default=constants.SCORES_PATH,
+                        help="Directory of score logs")
+    parser.add_argument("--follow", action="store_true",
+                        help="Keep reading scores as they're logged")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="Seconds between reads when following")
+    parser.add_argument("--percentiles", type=float, nargs="+",
+                        default=[50, 90, 99],
+                        help="Score percentiles to show")
+    args = parser.parse_args()
+
+    follower = LogFollower(args.path)
+    solver_stats: Dict[str, SolverStats] = {}
+    try:
+        while True:
+            summarise(follower, solver_stats)
+            report = format_stats(
+                sorted(solver_stats.values(), key=lambda s: s.solver),
+                args.percentiles
+            )
+            if not args.follow:
+                print(report)
+                break
+            # Redraw the table in place
+            print(f'\033[H\033[J{report}', flush=True)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
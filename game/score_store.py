@@ -0,0 +1,207 @@
+import argparse
+import sqlite3
+import time
+from typing import Optional, List, Dict, Tuple, Iterable
+
+# The database's file name in a ScoreLogger's directory
+DATABASE_NAME = 'scores.db'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    solver TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    steps INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    reason TEXT,
+    seed INTEGER,
+    duration REAL NOT NULL,
+    time REAL NOT NULL
+);
+-- Covers the aggregate queries, which group by solver, board size and
+-- score, so they never need to read the table itself
+CREATE INDEX IF NOT EXISTS games_by_config
+    ON games (solver, width, height, score, won, time);
+CREATE INDEX IF NOT EXISTS games_by_time ON games (time);
+'''
+
+# Solver, width, height, score, steps, won, reason, seed, duration and time
+Row = Tuple[str, int, int, int, int, int, Optional[str], Optional[int],
+            float, float]
+
+# The fraction of the logged time span below which a time-only query finds
+# its games by time, rather than scanning the covering index
+RECENT_FRACTION = 0.02
+
+
+def percentile(score_counts: List[Tuple[int, int]], p: float) -> int:
+    """
+    :param score_counts: Number of games by score, in increasing order of
+    score
+    :return: The smallest score that at least p percent of games scored no
+    more than
+    """
+    rank = p / 100 * sum(games for _, games in score_counts)
+    seen = 0
+    for score, games in score_counts:
+        seen += games
+        if seen >= rank:
+            return score
+    return score_counts[-1][0]
+
+
+class ScoreSummary:
+    """
+    Aggregates of the games played by one solver on one board size, built
+    from how many games ended with each score.
+    """
+    def __init__(self, solver: str, width: int, height: int):
+        self.solver = solver
+        self.width = width
+        self.height = height
+        self.games = 0
+        self.wins = 0
+        # Number of games by score, in increasing order of score
+        self.score_counts: List[Tuple[int, int]] = []
+
+    def add(self, score: int, games: int, wins: int):
+        self.games += games
+        self.wins += wins
+        self.score_counts.append((score, games))
+
+    @property
+    def mean(self) -> float:
+        return sum(s * n for s, n in self.score_counts) / self.games
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games
+
+    def percentile(self, p: float) -> int:
+        return percentile(self.score_counts, p)
+
+
+class ScoreStore:
+    """
+    Every game's outcome in a SQLite database, indexed so that aggregates
+    for a solver and board size stay fast with millions of games.
+    """
+    def __init__(self, path: str):
+        # Only ever used by one thread at a time, but not always the one
+        # that opened it
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+
+    def add(self, rows: Iterable[Row]):
+        with self._connection:
+            self._connection.executemany(
+                'INSERT INTO games (solver, width, height, score, steps, '
+                'won, reason, seed, duration, time) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+
+    def summaries(self, solver: Optional[str] = None,
+                  size: Optional[Tuple[int, int]] = None,
+                  since: Optional[float] = None) -> List[ScoreSummary]:
+        """
+        :param since: Only include games logged after this time
+        :return: A summary for each solver and board size
+        """
+        conditions, params = [], []
+        if solver is not None:
+            conditions.append('solver = ?')
+            params.append(solver)
+        if size is not None:
+            conditions.append('width = ? AND height = ?')
+            params.extend(size)
+        if since is not None:
+            conditions.append('time >= ?')
+            params.append(since)
+        where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+        # Without statistics on how times are spread, SQLite always scans
+        # the covering index, which is slow for a few recent games
+        hint = ''
+        if solver is None and size is None and since is not None \
+                and self._is_recent(since):
+            hint = 'INDEXED BY games_by_time'
+        rows = self._connection.execute(
+            'SELECT solver, width, height, score, COUNT(*), SUM(won) '
+            f'FROM games {hint} {where} '
+            'GROUP BY solver, width, height, score '
+            'ORDER BY solver, width, height, score',
+            params
+        )
+        summaries: Dict[Tuple[str, int, int], ScoreSummary] = {}
+        for solver, width, height, score, games, wins in rows:
+            key = (solver, width, height)
+            if key not in summaries:
+                summaries[key] = ScoreSummary(solver, width, height)
+            summaries[key].add(score, games, wins)
+        return list(summaries.values())
+
+    def _is_recent(self, since: float) -> bool:
+        """
+        :return: Whether games logged after since are likely to be only a
+        small fraction of them, judging by the span of logged times
+        """
+        first, last = self._connection.execute(
+            'SELECT MIN(time), MAX(time) FROM games'
+        ).fetchone()
+        if first is None or last <= first:
+            return False
+        return (last - since) / (last - first) < RECENT_FRACTION
+
+    def close(self):
+        self._connection.close()
+
+
+def format_summaries(summaries: List[ScoreSummary],
+                     percentiles: List[float]) -> str:
+    lines = [
+        f'{"solver":<30} {"size":>7} {"games":>9} {"mean":>8} '
+        f'{"win %":>6} ' + ' '.join(f'{f"p{p:g}":>6}' for p in percentiles)
+    ]
+    for s in summaries:
+        lines.append(
+            f'{s.solver:<30} {f"{s.width}x{s.height}":>7} {s.games:>9} '
+            f'{s.mean:>8.2f} {s.win_rate * 100:>6.1f} ' +
+            ' '.join(f'{s.percentile(p):>6}' for p in percentiles)
+        )
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    from game import constants
+    from game.solvers.cycle_store import parse_size
+
+    parser = argparse.ArgumentParser(
+        description="Summarise the games logged to a score database"
+    )
+    parser.add_argument("--path",
+                        default=f'{constants.SCORES_PATH}/{DATABASE_NAME}',
+                        help="Score database")
+    parser.add_argument("--solver", default=None,
+                        help="Only include this solver's short name")
+    parser.add_argument("--size", default=None,
+                        help="Only include this board size, e.g. 20 or 30x20")
+    parser.add_argument("--days", type=float, default=None,
+                        help="Only include games from the last this many "
+                             "days")
+    parser.add_argument("--percentiles", type=float, nargs="+",
+                        default=[50, 90, 99],
+                        help="Score percentiles to show")
+    args = parser.parse_args()
+
+    store = ScoreStore(args.path)
+    print(format_summaries(
+        store.summaries(
+            solver=args.solver,
+            size=None if args.size is None else parse_size(args.size),
+            since=None if args.days is None
+            else time.time() - args.days * 24 * 60 * 60
+        ),
+        args.percentiles
+    ))
@@ -1,20 +1,203 @@
+import atexit
 import csv
 import os
+import struct
+import threading
+import time
+from typing import Optional, Dict, List, Iterator
+
+from game.environment import death_reason
+from game.score_store import ScoreStore, DATABASE_NAME
+
+CSV = 'csv'
+BINARY = 'binary'
+SQLITE = 'sqlite'
+FORMATS = (CSV, BINARY, SQLITE)
+
+# Score, steps, death reason, seed and duration in seconds
+RECORD = struct.Struct('<IIBqd')
+# Stored in place of a seed when there wasn't one
+NO_SEED = -1
+
+
+class ScoreRecord:
+    """
+    The outcome of one game as logged by a ScoreLogger. The binary format
+    doesn't store the board size or time.
+    """
+    def __init__(self, score: int, steps: int = 0,
+                 reason: Optional[death_reason.DeathReason] = None,
+                 seed: Optional[int] = None, duration: float = 0.0,
+                 width: int = 0, height: int = 0, logged_at: float = 0.0):
+        self.score = score
+        self.steps = steps
+        self.reason = reason
+        self.seed = seed
+        self.duration = duration
+        self.width = width
+        self.height = height
+        self.logged_at = logged_at
+
+    def pack(self) -> bytes:
+        seed = NO_SEED if self.seed is None else self.seed
+        return RECORD.pack(
+            self.score, self.steps, death_reason.to_code(self.reason), seed,
+            self.duration
+        )
+
+    @staticmethod
+    def unpack(data: bytes) -> 'ScoreRecord':
+        score, steps, reason, seed, duration = RECORD.unpack(data)
+        return ScoreRecord(
+            score=score,
+            steps=steps,
+            reason=death_reason.from_code(reason),
+            seed=None if seed == NO_SEED else seed,
+            duration=duration
+        )
+
+
+def read_records(path: str) -> Iterator[ScoreRecord]:
+    """
+    :param path: A file written by a binary ScoreLogger
+    """
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    # Ignore a partly written record at the end
+    end = len(data) - len(data) % RECORD.size
+    for offset in range(0, end, RECORD.size):
+        yield ScoreRecord.unpack(data[offset:offset + RECORD.size])
 
 
 class ScoreLogger:
-    def __init__(self, base_path: str):
+    """
+    Appends scores to one file per model. Scores are held in memory and
+    written in batches by a background thread, either when batch_size
+    scores are waiting or every flush_interval seconds, and whatever is
+    left is written when the logger is closed or the program exits. If
+    the background thread fails to write a batch, those scores are lost
+    and the error is raised by the next call to log_score, flush or close.
+
+    CSV files hold just the score. Binary files hold a fixed size record
+    per game with its score, steps, death reason, seed and duration. With
+    SQLITE, every model's games go in one indexed database instead, which
+    can be summarised with game.score_store.
+    """
+    def __init__(self, base_path: str, score_format: str = CSV,
+                 batch_size: int = 1000, flush_interval: float = 1.0):
         if not base_path.endswith('/'):
             base_path += '/'
         self._base_path = base_path
+        self._format = score_format
+        self._store: Optional[ScoreStore] = None
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending: Dict[str, List[ScoreRecord]] = {}
+        self._pending_count = 0
+        self._created_dirs = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        # The error the background thread last failed with, until raised
+        self._error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
 
     def _path_for_file(self, file_name: str) -> str:
-        return f'{self._base_path}{file_name}.csv'
+        extension = 'scores' if self._format == BINARY else 'csv'
+        return f'{self._base_path}{file_name}.{extension}'
+
+    def log_score(self, file_name: str, score: int, steps: int = 0,
+                  reason: Optional[death_reason.DeathReason] = None,
+                  seed: Optional[int] = None, duration: float = 0.0,
+                  width: int = 0, height: int = 0):
+        if self._closed:
+            raise Exception('can not log a score to a closed ScoreLogger')
+        self._raise_error()
+        record = ScoreRecord(
+            score, steps, reason, seed, duration, width, height, time.time()
+        )
+        with self._lock:
+            self._pending.setdefault(file_name, []).append(record)
+            self._pending_count += 1
+            if self._pending_count >= self._batch_size:
+                self._wake.set()
+
+    def flush(self):
+        """
+        Write every waiting score now.
+        """
+        self._flush()
+        self._raise_error()
+
+    def _flush(self):
+        # Only one flush writes at a time, so batches stay in order
+        with self._flush_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = {}
+                self._pending_count = 0
+            for file_name, records in pending.items():
+                if self._format == SQLITE:
+                    self._insert(file_name, records)
+                else:
+                    self._write(self._path_for_file(file_name), records)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        try:
+            self.flush()
+        finally:
+            if self._store is not None:
+                self._store.close()
+            atexit.unregister(self.close)
 
-    def log_score(self, file_name: str, score: int):
-        path = self._path_for_file(file_name)
+    def _raise_error(self):
+        with self._lock:
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            try:
+                self._flush()
+            except Exception as e:
+                with self._lock:
+                    self._error = e
+
+    def _make_dirs(self, path: str):
         dir_path = os.path.dirname(path)
-        os.makedirs(dir_path, exist_ok=True)
-        with open(path, "a+") as fh:
-            writer = csv.writer(fh)
-            writer.writerow([score])
+        if dir_path not in self._created_dirs:
+            os.makedirs(dir_path, exist_ok=True)
+            self._created_dirs.add(dir_path)
+
+    def _insert(self, file_name: str, records: List[ScoreRecord]):
+        if self._store is None:
+            path = f'{self._base_path}{DATABASE_NAME}'
+            self._make_dirs(path)
+            self._store = ScoreStore(path)
+        self._store.add(
+            (file_name, r.width, r.height, r.score, r.steps, r.reason is None,
+             None if r.reason is None else r.reason.reason, r.seed,
+             r.duration, r.logged_at)
+            for r in records
+        )
+
+    def _write(self, path: str, records: List[ScoreRecord]):
+        self._make_dirs(path)
+        if self._format == BINARY:
+            with open(path, 'ab') as fh:
+                fh.write(b''.join(r.pack() for r in records))
+        else:
+            with open(path, 'a+') as fh:
+                writer = csv.writer(fh)
+                writer.writerows([r.score] for r in records)
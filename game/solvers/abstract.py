@@ -1,9 +1,13 @@
+from __future__ import annotations
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict
 
-from pygame.event import Event
 from game.environment.environment import Environment
 from game.environment import action as act
 
+if TYPE_CHECKING:
+    from pygame.event import Event
+
 
 class AbstractModel(ABC):
     def __init__(self, long_name: str, short_name: str, abbreviation: str):
@@ -31,3 +35,9 @@ class AbstractModel(ABC):
         Called on snake death.
         """
         pass
+
+    def counters(self) -> Dict[str, int]:
+        """
+        Solver specific counters, reported at the end of a run.
+        """
+        return {}
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Dict
 
 from game.solvers.abstract import AbstractModel
 from game.environment import action as act, tile
@@ -17,6 +17,8 @@ class BreadthFirstSearchLongestPath(AbstractModel):
         )
         self._bfss = BreadthFirstSearchShortestPath()
         self._next_actions = []
+        self.paths_expanded = 0
+        self.detours = 0
 
     def next_action(self, environment: Environment) -> act.Action:
         # We don't re-calculate the longest path each tick
@@ -38,6 +40,13 @@ class BreadthFirstSearchLongestPath(AbstractModel):
         # Return the next action in our list
         return self._next_actions.pop(0)
 
+    def counters(self) -> Dict[str, int]:
+        return {
+            'nodes expanded': self._bfss.nodes_expanded,
+            'paths expanded': self.paths_expanded,
+            'detours': self.detours,
+        }
+
     def longest_path(self, env: Environment, from_vector: Vector,
                      to_vector: Vector, first_move: Vector
                      ) -> Optional[List[Vector]]:
@@ -50,14 +59,8 @@ class BreadthFirstSearchLongestPath(AbstractModel):
         )
         if not shortest_path:
             return None
-        path_len = len(shortest_path)
-        # Attempt to make the path longer
-        longest_path = self._expand_path(env, shortest_path, to_vector)
-        # As long as we are making the path longer, keep doing so
-        while len(longest_path) > path_len:
-            path_len = len(longest_path)
-            longest_path = self._expand_path(env, longest_path, to_vector)
-        return longest_path
+        # Make the path as long as possible
+        return self._expand_path(env, shortest_path, to_vector)
 
     def build_next_actions(self, env: Environment, from_vector: Vector,
                            to_vector: Vector) -> Optional[List[act.Action]]:
@@ -77,65 +80,72 @@ class BreadthFirstSearchLongestPath(AbstractModel):
 
     def _expand_path(self, env: Environment, path: List[Vector], goal: Vector
                      ) -> List[Vector]:
-        # Get a copy of the path
-        longest_path = [v for v in path]
-        # This HAS to be 0. In the case where the snake hasn't eaten the path
-        # is from head to tail.
-        i = 0
-        while i < len(path) - 1:
-            a = longest_path[i]
-            b = longest_path[i + 1]
-            # Calculate which direction the step is in
-            direction = b - a
-
-            dir_action = act.vector_to_action(direction)
-
-            # Rotate the direction, and check if there are 2 spaces clear
-            rotated_l = act.action_to_relative_left(dir_action)
-            if self._extend_if_possible(
-                    env, a, b, rotated_l.vector,
-                    longest_path, i, goal):
-                break
-
-            # Check the 2 spaces on the opposite side
-            rotated_r = act.action_to_relative_left(dir_action)
-            if self._extend_if_possible(
-                    env, a, b, rotated_r.vector,
-                    longest_path, i, goal):
-                break
-            i += 1
-        return longest_path
-
-    def _can_populate_vectors(self, env: Environment, a: Vector, b: Vector,
-                              path: List[Vector], goal: Vector) -> bool:
-        if not self._can_populate_vector(env, a, path, goal):
+        """
+        Repeatedly replace the first step a -> b it can with a detour
+        a -> a' -> b' -> b, where a' and b' are the free cells to the left
+        of a and b, until no step can be replaced.
+
+        The path is held as a linked list of cells with a membership
+        bitmap, so each detour is O(1). Cells are only ever added to the
+        path, so a step that can't be replaced never can be later, and
+        one sweep tries each step once from a worklist.
+        """
+        self.paths_expanded += 1
+        cells = [env.cell_of(v) for v in path]
+        on_path = bytearray(env.cells_count())
+        for cell in cells:
+            on_path[cell] = 1
+        on_path[env.cell_of(goal)] = 1
+        next_cell = {a: b for a, b in zip(cells, cells[1:])}
+
+        # Offsets to the cell to the left of each step direction
+        left = {
+            env.cell_of(a.vector):
+                env.cell_of(act.action_to_relative_left(a).vector)
+            for a in act.ALL
+        }
+
+        # Steps are taken from the end, so the first step is tried first
+        worklist = self._path_cells(cells[0], next_cell)[-2::-1]
+        while worklist:
+            a = worklist.pop()
+            b = next_cell[a]
+            a_adjacent = a + left[b - a]
+            b_adjacent = b + left[b - a]
+            if not self._can_populate_cell(env, a_adjacent, on_path):
+                continue
+            if not self._can_populate_cell(env, b_adjacent, on_path):
+                continue
+            next_cell[a] = a_adjacent
+            next_cell[a_adjacent] = b_adjacent
+            next_cell[b_adjacent] = b
+            on_path[a_adjacent] = 1
+            on_path[b_adjacent] = 1
+            worklist.extend((b_adjacent, a_adjacent, a))
+            self.detours += 1
+
+        return [
+            env.cell_vector(cell)
+            for cell in self._path_cells(cells[0], next_cell)
+        ]
+
+    @staticmethod
+    def _path_cells(cell: int, next_cell: Dict[int, int]) -> List[int]:
+        cells = [cell]
+        while cell in next_cell:
+            cell = next_cell[cell]
+            cells.append(cell)
+        return cells
+
+    def _can_populate_cell(self, env: Environment, cell: int,
+                           on_path: bytearray) -> bool:
+        if not 0 <= cell < len(on_path):
             return False
-        if not self._can_populate_vector(env, b, path, goal):
+        if on_path[cell]:
             return False
-        return True
-
-    def _can_populate_vector(self, env: Environment, vector: Vector,
-                             path: List[Vector], goal: Vector) -> bool:
-        t = env.tile_at(vector)
+        t = env.tile_at_cell(cell)
         if t == tile.WALL:
             return False
         if t == tile.SNAKE:
             return False
-        if vector in path:
-            return False
-        if vector == goal:
-            return False
         return True
-
-    def _extend_if_possible(self, env: Environment, a: Vector, b: Vector,
-                            rotation: Vector, path: List[Vector], i: int,
-                            goal: Vector) -> bool:
-        a_adjacent = a + rotation
-        b_adjacent = b + rotation
-
-        if self._can_populate_vectors(env, a_adjacent, b_adjacent,
-                                      path, goal):
-            path.insert(i + 1, b_adjacent)
-            path.insert(i + 1, a_adjacent)
-            return True
-        return False
@@ -1,20 +1,19 @@
-from typing import List, Optional
+from typing import List, Optional, Dict
 
 from game.solvers.abstract import AbstractModel
 from game.environment import action as act, tile
 from game.environment.environment import Environment
-from game.vector import Vector, to_direction_vectors
+from game.vector import Vector
 
-
-class OwnedVector(Vector):
-    def __init__(self, x: int, y: int, owner: Vector):
-        super(OwnedVector, self).__init__(x, y)
-        self.owner = owner
+UNREACHED = -1
 
 
 class BreadthFirstSearchShortestPath(AbstractModel):
     """
     https://en.wikipedia.org/wiki/Breadth-first_search
+
+    Searches over the environment's cells using flat seen/parent arrays
+    and a preallocated queue, which are reused between searches.
     """
 
     def __init__(self):
@@ -23,99 +22,205 @@ class BreadthFirstSearchShortestPath(AbstractModel):
             "breadth_first_search_shortest",
             "bfss"
         )
+        self._seen: List[int] = []
+        self._parents: List[int] = []
+        self._queue: List[int] = []
+        self._generation = 0
+        # Distance of every cell from the fruit, reused between ticks
+        self._distances: Optional[List[int]] = None
+        self._field_fruit = -1
+        self._expected_head: Optional[int] = None
+        self._last_tail = -1
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.nodes_expanded = 0
 
     def next_action(self, environment: Environment) -> act.Action:
-        next_vectors = self.shortest_path(
-            environment,
-            environment.snake.head(),
-            environment.fruit.get_vector(),
-            environment.snake.action.vector
-        )
-        if not next_vectors:
+        head = environment.cell_of(environment.snake.head())
+        fruit = environment.cell_of(environment.fruit.get_vector())
+        if self._field_is_valid(environment, head, fruit):
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+            self._build_field(environment, fruit)
+
+        next_action = self._descend(environment, head)
+        if next_action is None:
             # If we didn't find the fruit, continue straight in hopes a path
             # will be available next tick
+            self._expected_head = None
             return environment.snake.action
-        next_steps = to_direction_vectors(next_vectors)
-        next_step = next_steps[0]
-        # We have the next vector we want to move into
-        # Map it to the appropriate action for the snake
-        return act.vector_to_action(next_step)
+        return next_action
+
+    def counters(self) -> Dict[str, int]:
+        return {
+            'field hits': self.cache_hits,
+            'field misses': self.cache_misses,
+            'nodes expanded': self.nodes_expanded,
+        }
+
+    def _build_field(self, env: Environment, fruit: int):
+        """
+        Breadth first search outwards from the fruit, recording how far
+        each reachable cell is from it.
+        """
+        distances = [UNREACHED] * env.cells_count()
+        distances[fruit] = 0
+        queue = [fruit]
+        for cell in queue:
+            d = distances[cell] + 1
+            for n in env.neighbours(cell):
+                if distances[n] != UNREACHED:
+                    continue
+                t = env.tile_at_cell(n)
+                if t == tile.WALL or t == tile.SNAKE:
+                    continue
+                distances[n] = d
+                queue.append(n)
+        self.nodes_expanded += len(queue)
+        self._distances = distances
+        self._field_fruit = fruit
+
+    def _field_is_valid(self, env: Environment, head: int,
+                        fruit: int) -> bool:
+        """
+        The field stays exact while the snake follows it: the head only
+        fills cells further from the fruit than where it is going. Each
+        tick the tail frees one cell, which can only make cells closer,
+        so it is repaired in place.
+        """
+        if self._distances is None:
+            return False
+        if fruit != self._field_fruit or head != self._expected_head:
+            return False
+        freed = self._last_tail
+        if env.tile_at_cell(freed) == tile.EMPTY:
+            self._repair_field(env, freed)
+        return True
+
+    def _repair_field(self, env: Environment, freed: int):
+        distances = self._distances
+        distances[freed] = UNREACHED
+        for n in env.neighbours(freed):
+            if self._is_open(env, n) and distances[n] != UNREACHED:
+                d = distances[n] + 1
+                if distances[freed] == UNREACHED or d < distances[freed]:
+                    distances[freed] = d
+        if distances[freed] == UNREACHED:
+            return
+        # Spread any shorter distances outwards from the freed cell
+        queue = [freed]
+        for cell in queue:
+            d = distances[cell] + 1
+            for n in env.neighbours(cell):
+                if not self._is_open(env, n):
+                    continue
+                if distances[n] == UNREACHED or distances[n] > d:
+                    distances[n] = d
+                    queue.append(n)
+        self.nodes_expanded += len(queue)
+
+    def _descend(self, env: Environment, head: int) -> Optional[act.Action]:
+        """
+        Step to the adjacent cell closest to the fruit, without reversing.
+        :return: None if the fruit can't be reached
+        """
+        distances = self._distances
+        reverse = env.snake.action.vector.reverse()
+        best_action, best_cell, best = None, None, UNREACHED
+        field_best = UNREACHED
+        for a in act.ALL:
+            n = head + env.cell_of(a.vector)
+            if not self._is_open(env, n) or distances[n] == UNREACHED:
+                continue
+            if field_best == UNREACHED or distances[n] < field_best:
+                field_best = distances[n]
+            if a.vector == reverse:
+                continue
+            if best == UNREACHED or distances[n] < best:
+                best_action, best_cell, best = a, n, distances[n]
+        if best_action is None:
+            return None
+        # Stepping away from the fruit breaks the field's assumptions
+        self._expected_head = best_cell if best == field_best else None
+        self._last_tail = env.cell_of(env.snake.tail())
+        return best_action
+
+    @staticmethod
+    def _is_open(env: Environment, cell: int) -> bool:
+        t = env.tile_at_cell(cell)
+        return t != tile.WALL and t != tile.SNAKE
+
+    def reset(self):
+        self._distances = None
+        self._expected_head = None
 
     def shortest_path(self, environment: Environment, from_vector: Vector,
                       to_vector: Vector, first_move: Vector
                       ) -> Optional[List[Vector]]:
-        # Search for path for fruit. Returned vector has the next vector.
-        fruit_vector = self._search_from(
-            environment,
-            from_vector,
-            to_vector,
-            first_move
-        )
-        if fruit_vector is None:
+        start = environment.cell_of(from_vector)
+        goal = environment.cell_of(to_vector)
+        # Search for path for fruit. Parents lead back to the start.
+        found = self._search_from(environment, start, goal, first_move)
+        if not found:
             return None
         vector_steps = []
 
         # Traverse backwards from the fruit towards to snake
-        current_step = fruit_vector
-        while True:
-            vector_steps.append(Vector(current_step.x, current_step.y))
-            if isinstance(current_step, OwnedVector):
-                current_step = current_step.owner
-            else:
-                break
+        current_step = goal
+        while current_step != start:
+            vector_steps.append(environment.cell_vector(current_step))
+            current_step = self._parents[current_step]
+        vector_steps.append(environment.cell_vector(start))
 
         # We traversed from fruit to snake, so reverse the list
         vector_steps.reverse()
         return vector_steps
 
-    def _search_from(self, env: Environment, start_vector: Vector,
-                     end_vector: Vector, first_move: Vector
-                     ) -> Optional[OwnedVector]:
-        seen_vectors = [start_vector]  # Don't process more than once
-        queue = [start_vector]  # First-in-first-out queue
-
-        while queue:
-            # Get the first vector from the queue
-            vector = queue.pop(0)
-            # Check if the tile at the vector is the goal
-            if vector == end_vector:
-                return vector
-            # Get adjacent vectors that we haven't seen yet
-            adjacent_vectors = self._unseen_adjacent_vectors(
-                env,
-                vector,
-                seen_vectors
-            )
-            # Add each adjacent vector to the queue
-            for v in adjacent_vectors:
-                if vector == start_vector:
-                    dir_vec = v - vector
-                    if first_move.is_reverse(dir_vec):
-                        continue
-                queue.append(OwnedVector(v.x, v.y, vector))
-                seen_vectors.append(v)
-
-    def _unseen_adjacent_vectors(self, env: Environment, vector: Vector,
-                                 seen_vectors: List[Vector]) -> List[Vector]:
-        adjacent_vectors = [
-            Vector(vector.x-1, vector.y,),
-            Vector(vector.x, vector.y-1,),
-            Vector(vector.x+1, vector.y,),
-            Vector(vector.x, vector.y+1,),
-        ]
-        searchable_vectors = []
-        for v in adjacent_vectors:
-            if v in seen_vectors:
-                continue
-            if self._should_search_vector(env, v):
-                searchable_vectors.append(v)
-        return searchable_vectors
-
-    def _should_search_vector(self, env: Environment, vector: Vector):
-        t = env.tile_at(vector)
-        # Snake can't move to a vector that would kill it
-        if t == tile.WALL:
-            return False
-        if t == tile.SNAKE:
-            return False
-        return True
+    def _search_from(self, env: Environment, start: int, end: int,
+                     first_move: Vector) -> bool:
+        cells = env.cells_count()
+        if len(self._seen) != cells:
+            self._seen = [0] * cells
+            self._parents = [0] * cells
+            self._queue = [0] * cells
+            self._generation = 0
+        # A cell has been seen this search if it holds the current
+        # generation, so the arrays never need clearing
+        self._generation += 1
+        generation = self._generation
+        seen = self._seen
+        parents = self._parents
+        queue = self._queue  # First-in-first-out queue
+        tile_at_cell = env.tile_at_cell
+        neighbours = env.neighbours
+        # The snake can't reverse into itself on the first move
+        reverse = start - env.cell_of(first_move)
+
+        seen[start] = generation
+        queue[0] = start
+        head, tail = 0, 1
+        while head < tail:
+            # Get the first cell from the queue
+            cell = queue[head]
+            head += 1
+            # Check if the cell is the goal
+            if cell == end:
+                self.nodes_expanded += head
+                return True
+            # Add each adjacent cell that we haven't seen yet to the queue
+            for n in neighbours(cell):
+                if seen[n] == generation:
+                    continue
+                t = tile_at_cell(n)
+                # Snake can't move to a cell that would kill it
+                if t == tile.WALL or t == tile.SNAKE:
+                    continue
+                if cell == start and n == reverse:
+                    continue
+                seen[n] = generation
+                parents[n] = cell
+                queue[tail] = n
+                tail += 1
+        self.nodes_expanded += head
+        return False
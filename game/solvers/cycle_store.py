@@ -0,0 +1,130 @@
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from typing import Optional, Sequence, Tuple, List
+
+LayoutKey = Tuple[int, int, Tuple[int, ...]]
+
+# Magic, width, height and number of cells, followed by the cells as
+# uint32s and then, for every cell of the board, its position in the
+# cycle as an int32, or -1 if it isn't in the cycle
+HEADER = struct.Struct('<4sIII')
+MAGIC = b'SNC2'
+
+
+class CycleStore:
+    """
+    Hamiltonian cycles saved to disk, one file per board shape and wall
+    layout. Each file is a small header followed by the cycle's cells and
+    where each cell is in it, which are loaded through mmap without being
+    copied or walked.
+    """
+    def __init__(self, base_path: str):
+        if not base_path.endswith('/'):
+            base_path += '/'
+        self._base_path = base_path
+
+    def _path_for_key(self, key: LayoutKey) -> str:
+        width, height, walls = key
+        digest = hashlib.sha1(array('I', walls).tobytes()).hexdigest()[:16]
+        return f'{self._base_path}{width}x{height}-{digest}.cycle'
+
+    def load(self, key: LayoutKey
+             ) -> Optional[Tuple[Sequence[int], Sequence[int]]]:
+        """
+        :return: The cycle's cells, and the position of every cell of the
+        board in the cycle, or None if there is no whole cycle stored for
+        the layout in this format
+        """
+        path = self._path_for_key(key)
+        try:
+            with open(path, 'rb') as fh:
+                mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        if len(mapped) < HEADER.size:
+            mapped.close()
+            return None
+        magic, width, height, length = HEADER.unpack_from(mapped)
+        if magic != MAGIC or \
+                len(mapped) != HEADER.size + (length + width * height) * 4:
+            # Saved by an older version, or cut short, so it will be built
+            # again
+            mapped.close()
+            return None
+        if (width, height) != key[:2]:
+            mapped.close()
+            raise Exception(f'{path} is not a cycle for {width}x{height}')
+        # The memoryviews keep the mapping open for as long as they're used
+        view = memoryview(mapped)
+        positions_start = HEADER.size + length * 4
+        cells = view[HEADER.size:positions_start].cast('I')
+        positions = view[
+            positions_start:positions_start + width * height * 4
+        ].cast('i')
+        return cells, positions
+
+    def save(self, key: LayoutKey, cells: Sequence[int]):
+        path = self._path_for_key(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so that other processes never
+        # load a partial cycle
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        positions = array('i', [-1]) * (key[0] * key[1])
+        for i, cell in enumerate(cells):
+            positions[cell] = i
+        with open(tmp_path, 'wb') as fh:
+            fh.write(HEADER.pack(MAGIC, key[0], key[1], len(cells)))
+            fh.write(array('I', cells).tobytes())
+            fh.write(positions.tobytes())
+        os.replace(tmp_path, path)
+
+    def exists(self, key: LayoutKey) -> bool:
+        return os.path.exists(self._path_for_key(key))
+
+
+def parse_size(size: str) -> Tuple[int, int]:
+    """
+    :param size: Either "20" for a square board, or "30x20"
+    """
+    if 'x' in size:
+        width, height = size.split('x')
+        return int(width), int(height)
+    return int(size), int(size)
+
+
+def precompute(store: CycleStore, sizes: List[Tuple[int, int]]):
+    from game.environment.environment import Environment
+    from game.solvers import cycles
+
+    for width, height in sizes:
+        env = Environment(width, height)
+        env.init_wall()
+        key = cycles.layout_key(env)
+        if store.load(key) is not None:
+            print(f'{width}x{height}: already stored')
+            continue
+        cells = cycles.serpentine(width, height)
+        if cells is None:
+            print(f'{width}x{height}: has no cycle')
+            continue
+        store.save(key, cells)
+        print(f'{width}x{height}: stored {len(cells)} cells')
+
+
+if __name__ == '__main__':
+    from game import constants
+
+    parser = argparse.ArgumentParser(
+        description="Precompute Hamiltonian cycles for border-walled boards"
+    )
+    parser.add_argument("sizes", nargs="+",
+                        help="Board sizes including the border, "
+                             "e.g. 20 or 30x20")
+    parser.add_argument("--path", default=constants.CYCLES_PATH,
+                        help="Directory to store cycles in")
+    args = parser.parse_args()
+    precompute(CycleStore(args.path), [parse_size(s) for s in args.sizes])
@@ -0,0 +1,132 @@
+from typing import List, Optional, Tuple, Dict, Sequence
+
+from game.environment.environment import Environment
+from game.solvers.cycle_store import CycleStore, LayoutKey
+
+
+class Cycle:
+    """
+    A Hamiltonian cycle over every free cell of a board, as a sequence of
+    cells where the last cell leads back to the first.
+    """
+    def __init__(self, cells: Sequence[int], cells_count: int,
+                 positions: Optional[Sequence[int]] = None):
+        """
+        :param positions: Where each cell is in the cycle, or -1 if it
+        isn't, if already known
+        """
+        self.cells = cells
+        if positions is None:
+            positions = [-1] * cells_count
+            for i, cell in enumerate(cells):
+                positions[cell] = i
+        self._positions = positions
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def position(self, cell: int) -> int:
+        return self._positions[cell]
+
+    def rotated(self, start: int, forwards: bool = True) -> List[int]:
+        """
+        :return: Every cell in the cycle, beginning and ending at start
+        """
+        i = self._positions[start]
+        if forwards:
+            cells = list(self.cells[i:]) + list(self.cells[:i])
+        else:
+            cells = list(self.cells[i::-1]) + list(self.cells[:i:-1])
+        cells.append(start)
+        return cells
+
+
+# Cycles that have been built, by board shape and wall layout
+_cycles: Dict[LayoutKey, Cycle] = {}
+# Where cycles are saved between runs, if anywhere
+_store: Optional[CycleStore] = None
+
+
+def use_store(store: Optional[CycleStore]):
+    """
+    Load cycles from, and save new cycles to, the given store.
+    """
+    global _store
+    _store = store
+
+
+def layout_key(env: Environment) -> LayoutKey:
+    walls = tuple(sorted(env.cell_of(v) for v in env.wall.get_vectors()))
+    return env.width, env.height, walls
+
+
+def border_cells(width: int, height: int) -> Tuple[int, ...]:
+    return tuple(
+        y * width + x for y in range(height) for x in range(width)
+        if x in (0, width - 1) or y in (0, height - 1)
+    )
+
+
+def serpentine(width: int, height: int) -> Optional[List[int]]:
+    """
+    Build a cycle around a board walled only at its border, in O(cells).
+
+    With an even number of rows the cycle runs along the top row, zig-zags
+    back and forth down the remaining columns, and returns up the first
+    column. With an even number of columns the same is done on its side.
+    A board with an odd number of both has no Hamiltonian cycle.
+    """
+    columns, rows = width - 2, height - 2
+    if columns < 2 or rows < 2:
+        return None
+    if rows % 2 == 0:
+        points = _serpentine_points(columns, rows)
+    elif columns % 2 == 0:
+        points = [(y, x) for x, y in _serpentine_points(rows, columns)]
+    else:
+        return None
+    return [(y + 1) * width + (x + 1) for x, y in points]
+
+
+def _serpentine_points(columns: int, rows: int) -> List[Tuple[int, int]]:
+    # Across the top row
+    points = [(x, 0) for x in range(columns)]
+    # Back and forth through every other column
+    for y in range(1, rows):
+        xs = range(columns - 1, 0, -1) if y % 2 else range(1, columns)
+        points.extend((x, y) for x in xs)
+    # Up the first column
+    points.extend((0, y) for y in range(rows - 1, 0, -1))
+    return points
+
+
+def cached_cycle(env: Environment) -> Optional[Cycle]:
+    """
+    :return: The cycle for the environment's board, built once per board
+    shape and wall layout, or None if it can't be constructed directly
+    """
+    key = layout_key(env)
+    if key in _cycles:
+        return _cycles[key]
+    if _store is not None:
+        stored = _store.load(key)
+        if stored is not None:
+            cells, positions = stored
+            cycle = Cycle(cells, env.cells_count(), positions)
+            _cycles[key] = cycle
+            return cycle
+    if key[2] != border_cells(env.width, env.height):
+        return None
+    cells = serpentine(env.width, env.height)
+    if cells is None:
+        return None
+    return cache_cycle(env, cells)
+
+
+def cache_cycle(env: Environment, cells: Sequence[int]) -> Cycle:
+    key = layout_key(env)
+    cycle = Cycle(cells, env.cells_count())
+    _cycles[key] = cycle
+    if _store is not None:
+        _store.save(key, cells)
+    return cycle
@@ -1,10 +1,13 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from game.solvers.abstract import AbstractModel
-from game.environment import action as act, tile
+from game.environment import action as act
 from game.environment.environment import Environment
+from game.solvers import cycles
 from game.solvers.breadth_first_search_longest import \
     BreadthFirstSearchLongestPath
+from game.solvers.breadth_first_search_shortest import \
+    BreadthFirstSearchShortestPath
 from game.vector import Vector, to_direction_vectors
 
 
@@ -19,10 +22,61 @@ class HamiltonianCycle(AbstractModel):
             "hc"
         )
         self._bfsl = BreadthFirstSearchLongestPath()
+        self._bfss = BreadthFirstSearchShortestPath()
         self._actions = []
         self._i = 0
 
     def build_cycle(self, env: Environment) -> Optional[List[Vector]]:
+        """
+        :return: A cycle over every free tile, beginning and ending at the
+        snake's head, or None if there isn't one the snake can follow
+        """
+        oriented = self.oriented_cycle(env)
+        if oriented is None:
+            return None
+        cycle, forwards = oriented
+        cells = cycle.rotated(env.cell_of(env.snake.head()), forwards)
+        return [env.cell_vector(cell) for cell in cells]
+
+    def oriented_cycle(self, env: Environment
+                       ) -> Optional[Tuple[cycles.Cycle, bool]]:
+        """
+        :return: The board's cycle and whether the snake follows it
+        forwards, or None if there isn't one the snake can follow
+        """
+        # The cycle only depends on the board, so it is built once and
+        # then followed from wherever the head is.
+        cycle = cycles.cached_cycle(env)
+        if cycle is None:
+            built = self._build_longest_path_cycle(env)
+            if built is None:
+                return None
+            cycle = cycles.cache_cycle(
+                env, [env.cell_of(v) for v in built[:-1]]
+            )
+        head = cycle.position(env.cell_of(env.snake.head()))
+        if head == -1:
+            return None
+        length = len(cycle)
+        body = [env.cell_of(v) for v in env.snake.get_vectors()]
+        reverse = env.snake.action.vector.reverse()
+        # Follow the cycle in whichever direction the snake is already
+        # lying along, without turning back on itself
+        for forwards in (True, False):
+            step = 1 if forwards else -1
+            if any(
+                cycle.position(cell) != (head - i * step) % length
+                for i, cell in enumerate(body)
+            ):
+                continue
+            ahead = cycle.cells[(head + step) % length]
+            if env.cell_vector(ahead) - env.snake.head() == reverse:
+                continue
+            return cycle, forwards
+        return None
+
+    def _build_longest_path_cycle(self, env: Environment
+                                  ) -> Optional[List[Vector]]:
         # Attempt to build the list of next actions
         head = env.snake.head()
         tail = env.snake.tail()
@@ -59,11 +113,9 @@ class HamiltonianCycle(AbstractModel):
         if not self._actions:
             cycle_vectors = self.build_cycle(environment)
             if not cycle_vectors:
-                # If we're not able to build them, it usually means there
-                # is no path to the fruit. Continue to any available position.
-                if environment.tile_at(environment.snake.head() + environment.snake.action.vector) != tile.EMPTY:
-                    return environment.random_action()
-                return environment.snake.action
+                # If we're not able to build them, the board has no cycle
+                # the snake can follow. Head for the fruit instead.
+                return self._bfss.next_action(environment)
             cycle_action_vectors = to_direction_vectors(cycle_vectors)
             self._actions = act.vectors_to_action(cycle_action_vectors)
             self._i = 0
@@ -77,5 +129,6 @@ class HamiltonianCycle(AbstractModel):
 
     def reset(self):
         self._bfsl.reset()
+        self._bfss.reset()
         self._actions = []
         self._i = 0
@@ -1,10 +1,11 @@
-from typing import Optional
+from typing import Optional, Dict
 
 from game.solvers.abstract import AbstractModel
 from game.environment import action as act, tile
 from game.environment.environment import Environment
+from game.solvers import cycles
 from game.solvers.hamiltonian_cycle import HamiltonianCycle
-from game.vector import to_direction_vectors
+from game.vector import Vector, to_direction_vectors
 
 
 class HamiltonianCycleOptimised(AbstractModel):
@@ -20,16 +21,33 @@ class HamiltonianCycleOptimised(AbstractModel):
         )
         self._hc = HamiltonianCycle()
         self._vectors = []
+        # The cached cycle that self._vectors follows, where the head was
+        # in it and which way round it is followed, so that where a cell
+        # is in self._vectors can be looked up in O(1)
+        self._cycle: Optional[cycles.Cycle] = None
+        self._start = 0
+        self._forwards = True
         self._actions = []
         self._i = 0
+        self.shortcuts = 0
+
+    def counters(self) -> Dict[str, int]:
+        return {'shortcuts taken': self.shortcuts}
 
     def next_action(self, environment: Environment) -> act.Action:
         if not self._actions:
-            cycle_vectors = self._hc.build_cycle(environment)
-            if not cycle_vectors:
-                # If we're not able to build them, it usually means there
-                # is no path to the fruit. Continue straight.
-                return environment.snake.action
+            oriented = self._hc.oriented_cycle(environment)
+            if oriented is None:
+                # The board has no cycle the snake can follow, so play
+                # just as HamiltonianCycle does without one
+                return self._hc.next_action(environment)
+            self._cycle, self._forwards = oriented
+            head = environment.cell_of(environment.snake.head())
+            self._start = self._cycle.position(head)
+            cycle_vectors = [
+                environment.cell_vector(cell)
+                for cell in self._cycle.rotated(head, self._forwards)
+            ]
             self._vectors = cycle_vectors
             cycle_action_vectors = to_direction_vectors(cycle_vectors)
             self._actions = act.vectors_to_action(cycle_action_vectors)
@@ -38,6 +56,7 @@ class HamiltonianCycleOptimised(AbstractModel):
         # If we find a shortcut, take it!
         shortcut_action = self._find_shortcut(environment)
         if shortcut_action:
+            self.shortcuts += 1
             return shortcut_action
 
         # Otherwise proceed as usual
@@ -60,14 +79,14 @@ class HamiltonianCycleOptimised(AbstractModel):
             v for v in possible_vectors if env.tile_at(v) == tile.EMPTY
         ]
 
-        head_i = self._vectors.index(env.snake.head())
-        tail_i = self._vectors.index(env.snake.tail())
-        fruit_i = self._vectors.index(env.fruit.get_vector())
+        head_i = self._index_of(env, env.snake.head())
+        tail_i = self._index_of(env, env.snake.tail())
+        fruit_i = self._index_of(env, env.fruit.get_vector())
 
         # Sort possible_vectors so that the most valuable shortcut is first
         fruit_is_higher_in_vectors = fruit_i > head_i
         possible_vectors.sort(
-            key=lambda v: self._vectors.index(v),
+            key=lambda v: self._index_of(env, v),
             reverse=fruit_is_higher_in_vectors
         )
 
@@ -80,7 +99,7 @@ class HamiltonianCycleOptimised(AbstractModel):
             tail_i = len(self._vectors) - abs(tail_i)
 
         for v in possible_vectors:
-            i = self._vectors.index(v)
+            i = self._index_of(env, v)
 
             if i == head_i + 1:
                 # Is next space
@@ -115,6 +134,14 @@ class HamiltonianCycleOptimised(AbstractModel):
             return act.vector_to_action(v - env.snake.head())
         return None
 
+    def _index_of(self, env: Environment, vector: Vector) -> int:
+        position = self._cycle.position(env.cell_of(vector))
+        if position == -1:
+            return -1
+        if self._forwards:
+            return (position - self._start) % len(self._cycle)
+        return (self._start - position) % len(self._cycle)
+
     def _tiles_between(self, from_i: int, to_i: int) -> int:
         if to_i > from_i:
             return to_i - from_i
@@ -143,5 +170,6 @@ class HamiltonianCycleOptimised(AbstractModel):
         super().reset()
         self._hc.reset()
         self._vectors = []
+        self._cycle = None
         self._actions = []
         self._i = 0
@@ -1,8 +1,12 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
 from game.solvers.abstract import AbstractModel
 from game.environment import action as act
 from game.environment.environment import Environment
-from pygame.locals import K_UP, K_DOWN, K_LEFT, K_RIGHT
-from pygame.event import Event
+
+if TYPE_CHECKING:
+    from pygame.event import Event
 
 
 class HumanSolver(AbstractModel):
@@ -21,6 +25,8 @@ class HumanSolver(AbstractModel):
         return environment.snake.action if backward_action else self._action
 
     def user_input(self, event: Event):
+        # Imported here so the solver can be loaded without pygame
+        from pygame.locals import K_UP, K_DOWN, K_LEFT, K_RIGHT
         if event.key == K_UP:
             self._action = act.UP
         elif event.key == K_DOWN:
@@ -0,0 +1,38 @@
+from unittest import TestCase
+from game.environment import action as act
+from game.environment.environment import Environment
+from game.solvers.breadth_first_search_longest import \
+    BreadthFirstSearchLongestPath
+from game.vector import Vector, to_direction_vectors
+
+
+class TestBreadthFirstSearchLongestPath(TestCase):
+    def setUp(self) -> None:
+        self._env = Environment(6, 6)
+        self._env.init_wall()
+        self._bfsl = BreadthFirstSearchLongestPath()
+
+    def _assert_valid(self, path, from_vector, to_vector):
+        self.assertEqual(path[0], from_vector)
+        self.assertEqual(path[-1], to_vector)
+        self.assertEqual(len(set(path)), len(path))
+        # Every step is to an adjacent tile
+        act.vectors_to_action(to_direction_vectors(path))
+
+    def test_covers_empty_board(self):
+        path = self._bfsl.longest_path(
+            self._env, Vector(1, 1), Vector(1, 2), act.RIGHT.vector
+        )
+        self._assert_valid(path, Vector(1, 1), Vector(1, 2))
+        self.assertEqual(len(path), self._env.available_tiles_count())
+
+    def test_only_detours_to_the_left(self):
+        path = self._bfsl.longest_path(
+            self._env, Vector(1, 1), Vector(2, 1), act.LEFT.vector
+        )
+        self._assert_valid(path, Vector(1, 1), Vector(2, 1))
+        # Only the right of the last step is free, and paths are only ever
+        # lengthened to the left
+        self.assertEqual(
+            path, [Vector(1, 1), Vector(1, 2), Vector(2, 2), Vector(2, 1)]
+        )
@@ -0,0 +1,62 @@
+from unittest import TestCase
+from game.environment import action as act, tile
+from game.environment.environment import Environment
+from game.solvers.breadth_first_search_shortest import \
+    BreadthFirstSearchShortestPath
+from game.vector import Vector
+
+
+class TestBreadthFirstSearchShortestPath(TestCase):
+    def setUp(self) -> None:
+        self._env = Environment(7, 7)
+        self._env.init_wall()
+        self._bfss = BreadthFirstSearchShortestPath()
+
+    def test_shortest_path(self):
+        path = self._bfss.shortest_path(
+            self._env, Vector(1, 1), Vector(3, 1), act.NONE.vector
+        )
+        self.assertEqual(path, [Vector(1, 1), Vector(2, 1), Vector(3, 1)])
+
+    def test_same_vector(self):
+        path = self._bfss.shortest_path(
+            self._env, Vector(2, 2), Vector(2, 2), act.UP.vector
+        )
+        self.assertEqual(path, [Vector(2, 2)])
+
+    def test_first_move_cannot_reverse(self):
+        # Moving left, so the first step can't be to the right
+        path = self._bfss.shortest_path(
+            self._env, Vector(2, 2), Vector(3, 2), act.LEFT.vector
+        )
+        self.assertEqual(len(path), 4)
+        self.assertEqual(path[0], Vector(2, 2))
+        self.assertNotEqual(path[1], Vector(3, 2))
+        self.assertEqual(path[-1], Vector(3, 2))
+
+    def test_no_path(self):
+        # Wall off the bottom right corner with snake
+        env = self._env
+        for v in [Vector(5, 4), Vector(4, 4), Vector(4, 5)]:
+            env._set_tile(env.cell_of(v), tile.SNAKE)
+        path = self._bfss.shortest_path(
+            env, Vector(1, 1), Vector(5, 5), act.NONE.vector
+        )
+        self.assertIsNone(path)
+
+    def test_next_action_reuses_field(self):
+        env = self._env
+        env.init_fruit()
+        env.init_snake()
+        env.snake.action = act.NONE
+        fruit = env.fruit.get_vector()
+        path = self._bfss.shortest_path(
+            env, env.snake.head(), fruit, env.snake.action.vector
+        )
+        for _ in range(len(path) - 1):
+            self.assertIsNone(env.step(self._bfss.next_action(env)))
+        self.assertEqual(env.snake.head(), fruit)
+        # Only the first tick needed a search
+        self.assertEqual(self._bfss.cache_misses, 1)
+        self.assertEqual(self._bfss.cache_hits, len(path) - 2)
+        self.assertEqual(self._bfss.counters()['field misses'], 1)
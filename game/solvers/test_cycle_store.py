@@ -0,0 +1,78 @@
+import os
+import tempfile
+from unittest import TestCase
+from game.environment.environment import Environment
+from game.solvers import cycles
+from game.solvers.cycle_store import CycleStore, parse_size
+
+
+class TestCycleStore(TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self._store = CycleStore(self._dir.name)
+        cycles._cycles.clear()
+
+    def tearDown(self) -> None:
+        cycles.use_store(None)
+        cycles._cycles.clear()
+        self._dir.cleanup()
+
+    def test_save_load(self):
+        key = (6, 4, (0, 1, 2))
+        self.assertIsNone(self._store.load(key))
+        self.assertFalse(self._store.exists(key))
+        self._store.save(key, [7, 8, 14, 13])
+        self.assertTrue(self._store.exists(key))
+        cells, positions = self._store.load(key)
+        self.assertEqual(list(cells), [7, 8, 14, 13])
+        self.assertEqual(len(positions), 6 * 4)
+        self.assertEqual(
+            [positions[c] for c in (7, 8, 14, 13, 0, 9)], [0, 1, 2, 3, -1, -1]
+        )
+        # Another wall layout is stored separately
+        self.assertIsNone(self._store.load((6, 4, (0, 1))))
+        self.assertEqual(os.listdir(self._dir.name)[0][-6:], '.cycle')
+
+    def test_truncated_files_are_rebuilt(self):
+        env = Environment(8, 6)
+        env.init_wall()
+        key = cycles.layout_key(env)
+        cycles.use_store(self._store)
+        built = cycles.cached_cycle(env)
+        path = os.path.join(self._dir.name, os.listdir(self._dir.name)[0])
+        with open(path, 'rb') as fh:
+            data = fh.read()
+        # Cut short in the header, the cells and the positions
+        for size in (8, 20, len(data) - 4):
+            with open(path, 'wb') as fh:
+                fh.write(data[:size])
+            self.assertIsNone(self._store.load(key))
+            cycles._cycles.clear()
+            self.assertEqual(list(cycles.cached_cycle(env).cells),
+                             list(built.cells))
+            self.assertEqual(os.path.getsize(path), len(data))
+
+    def test_cached_cycle_uses_store(self):
+        env = Environment(8, 6)
+        env.init_wall()
+        cycles.use_store(self._store)
+        built = cycles.cached_cycle(env)
+        self.assertTrue(self._store.exists(cycles.layout_key(env)))
+
+        # A fresh process would load the stored cycle rather than build it
+        cycles._cycles.clear()
+        loaded = cycles.cached_cycle(env)
+        self.assertIsNot(loaded, built)
+        self.assertEqual(list(loaded.cells), list(built.cells))
+        head = built.cells[3]
+        self.assertEqual(loaded.rotated(head), built.rotated(head))
+        self.assertEqual(loaded.rotated(head, False),
+                         built.rotated(head, False))
+        self.assertEqual(
+            [loaded.position(c) for c in range(env.cells_count())],
+            [built.position(c) for c in range(env.cells_count())]
+        )
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size('20'), (20, 20))
+        self.assertEqual(parse_size('30x20'), (30, 20))
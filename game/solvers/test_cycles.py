@@ -0,0 +1,55 @@
+from unittest import TestCase
+from game.environment import action as act
+from game.environment.environment import Environment
+from game.solvers import cycles
+from game.solvers.hamiltonian_cycle import HamiltonianCycle
+from game.vector import to_direction_vectors
+
+
+class TestSerpentine(TestCase):
+    def _assert_cycle(self, width, height, cells):
+        self.assertEqual(len(cells), (width - 2) * (height - 2))
+        self.assertEqual(len(set(cells)), len(cells))
+        for a, b in zip(cells, cells[1:] + cells[:1]):
+            ax, ay = a % width, a // width
+            bx, by = b % width, b // width
+            self.assertEqual(abs(ax - bx) + abs(ay - by), 1)
+            self.assertTrue(0 < bx < width - 1 and 0 < by < height - 1)
+
+    def test_even(self):
+        for width, height in [(4, 4), (6, 5), (5, 6), (7, 8), (12, 12)]:
+            self._assert_cycle(width, height, cycles.serpentine(width, height))
+
+    def test_odd(self):
+        self.assertIsNone(cycles.serpentine(5, 5))
+        self.assertIsNone(cycles.serpentine(13, 7))
+        self.assertIsNone(cycles.serpentine(3, 8))
+
+    def test_rotated(self):
+        cycle = cycles.Cycle([5, 6, 10, 9], 16)
+        self.assertEqual(cycle.rotated(10), [10, 9, 5, 6, 10])
+        self.assertEqual(cycle.rotated(10, False), [10, 6, 5, 9, 10])
+        self.assertEqual(cycle.position(9), 3)
+        self.assertEqual(cycle.position(0), -1)
+
+
+class TestHamiltonianCycle(TestCase):
+    def test_build_cycle_from_head(self):
+        env = Environment(8, 8)
+        env.init_wall()
+        env.init_fruit()
+        hc = HamiltonianCycle()
+        for a in act.ALL:
+            env.init_snake()
+            env.snake.action = a
+            built = hc.build_cycle(env)
+            self.assertEqual(built[0], env.snake.head())
+            self.assertEqual(built[-1], env.snake.head())
+            self.assertEqual(len(built), env.available_tiles_count() + 1)
+            actions = act.vectors_to_action(to_direction_vectors(built))
+            self.assertFalse(a.vector.is_reverse(actions[0].vector))
+
+    def test_cycle_is_cached(self):
+        env = Environment(10, 6)
+        env.init_wall()
+        self.assertIs(cycles.cached_cycle(env), cycles.cached_cycle(env))
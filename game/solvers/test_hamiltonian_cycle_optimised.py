@@ -0,0 +1,29 @@
+from unittest import TestCase
+from game.environment.environment import Environment
+from game.headless import HeadlessGame
+from game.solvers.hamiltonian_cycle import HamiltonianCycle
+from game.solvers.hamiltonian_cycle_optimised import \
+    HamiltonianCycleOptimised
+
+
+class TestHamiltonianCycleOptimised(TestCase):
+    def test_index_of_matches_cycle(self):
+        env = Environment(10, 8)
+        env.init_wall()
+        env.init_fruit()
+        env.init_snake()
+        hco = HamiltonianCycleOptimised()
+        for _ in range(50):
+            if env.step(hco.next_action(env)):
+                break
+            for i, v in enumerate(hco._vectors):
+                self.assertEqual(
+                    hco._index_of(env, v), hco._vectors.index(v)
+                )
+
+    def test_falls_back_like_hamiltonian_cycle(self):
+        # A 7x7 inside has an odd number of tiles, so no cycle
+        def scores(model):
+            return HeadlessGame(model, 9, 9, seed=1).run(max_games=5).scores
+        self.assertEqual(scores(HamiltonianCycleOptimised()),
+                         scores(HamiltonianCycle()))
@@ -0,0 +1,206 @@
+import argparse
+import os
+import random
+import struct
+from array import array
+from typing import List, Optional
+
+from game.environment import action as act
+from game.environment.environment import Environment
+
+# Magic, width, height, fruit cell, head action and snake length,
+# followed by the snake's cells, head first
+HEADER = struct.Struct('<4sHHIBI')
+MAGIC = b'SNKS'
+# Random moves made to a path per cell it covers, before it is used
+MIX_MOVES_PER_CELL = 10
+
+
+def _boustrophedon(env: Environment) -> List[int]:
+    # Every free cell, back and forth along each row in turn
+    cells = []
+    for y in range(1, env.height - 1):
+        xs = range(1, env.width - 1)
+        if y % 2 == 0:
+            xs = reversed(xs)
+        cells.extend(y * env.width + x for x in xs)
+    return cells
+
+
+def random_path(env: Environment, rand: random.Random) -> List[int]:
+    """
+    :return: A random path through every free cell of a board walled only
+    at its border
+
+    Starts from a path back and forth along the rows and makes backbite
+    moves: one end of the path steps to a neighbour somewhere along it,
+    and the part of the path between them is reversed so it stays a path.
+    """
+    path = _boustrophedon(env)
+    last = len(path) - 1
+    positions = [-1] * env.cells_count()
+    for i, cell in enumerate(path):
+        positions[cell] = i
+    neighbours = [
+        [n for n in env.neighbours(cell) if positions[n] != -1]
+        if positions[cell] != -1 else []
+        for cell in range(env.cells_count())
+    ]
+    for _ in range(MIX_MOVES_PER_CELL * len(path)):
+        if rand.random() < 0.5:
+            i = positions[rand.choice(neighbours[path[-1]])]
+            if i == last - 1:
+                continue
+            path[i + 1:] = path[:i:-1]
+            changed = range(i + 1, len(path))
+        else:
+            i = positions[rand.choice(neighbours[path[0]])]
+            if i == 1:
+                continue
+            path[:i] = path[i - 1::-1]
+            changed = range(i)
+        for j in changed:
+            positions[path[j]] = j
+    return path
+
+
+class SyntheticState:
+    """
+    A snake and fruit on a border-walled board, as they would be partway
+    through a game.
+    """
+    def __init__(self, width: int, height: int, snake: List[int],
+                 action: int, fruit: int):
+        """
+        :param snake: The snake's cells, head first
+        :param action: The snake's action, as its index in act.ALL
+        """
+        self.width = width
+        self.height = height
+        self.snake = snake
+        self.action = action
+        self.fruit = fruit
+
+    def environment(self, seed: Optional[int] = None) -> Environment:
+        """
+        :param seed: Seeds where fruit appears after this one is eaten
+        """
+        env = Environment(self.width, self.height, seed=seed)
+        env.init_wall()
+        env.place_snake(
+            [env.cell_vector(cell) for cell in self.snake],
+            act.ALL[self.action]
+        )
+        env.init_fruit(env.cell_vector(self.fruit))
+        return env
+
+    def to_bytes(self) -> bytes:
+        return HEADER.pack(
+            MAGIC, self.width, self.height, self.fruit, self.action,
+            len(self.snake)
+        ) + array('I', self.snake).tobytes()
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'SyntheticState':
+        magic, width, height, fruit, action, length = \
+            HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise Exception('not a synthetic state')
+        snake = array('I')
+        snake.frombytes(data[HEADER.size:HEADER.size + length * 4])
+        return SyntheticState(width, height, list(snake), action, fruit)
+
+
+def generate(width: int, height: int, occupancy: float,
+             seed: int) -> SyntheticState:
+    """
+    :param occupancy: Fraction of the free tiles the snake covers
+    :return: A random snake covering that much of the board, with a fruit
+    on one of the tiles left. The snake's head leads into a path through
+    every free tile, so the snake is never already trapped.
+    """
+    env = Environment(width, height)
+    env.init_wall()
+    rand = random.Random(seed)
+    path = random_path(env, rand)
+    length = max(1, min(len(path) - 1, round(occupancy * len(path))))
+    snake = path[length - 1::-1]
+    # The way the head last moved, or for a lone head, into the path
+    if length == 1:
+        vector = env.cell_vector(path[1]) - env.cell_vector(path[0])
+    else:
+        vector = env.cell_vector(snake[0]) - env.cell_vector(snake[1])
+    action = act.ALL.index(act.vector_to_action(vector))
+    fruit = path[rand.randrange(length, len(path))]
+    return SyntheticState(width, height, snake, action, fruit)
+
+
+class StateStore:
+    """
+    Synthetic states saved to disk, one file per board size, occupancy and
+    seed, so that large boards are only generated once.
+    """
+    def __init__(self, base_path: str):
+        self._base_path = base_path
+
+    def _path_for(self, width: int, height: int, occupancy: float,
+                  seed: int) -> str:
+        return os.path.join(
+            self._base_path, f'{width}x{height}-{occupancy:g}-{seed}.state'
+        )
+
+    def get(self, width: int, height: int, occupancy: float,
+            seed: int) -> SyntheticState:
+        """
+        :return: The stored state, generating and storing it if there
+        isn't one
+        """
+        path = self._path_for(width, height, occupancy, seed)
+        try:
+            with open(path, 'rb') as fh:
+                return SyntheticState.from_bytes(fh.read())
+        except FileNotFoundError:
+            pass
+        state = generate(width, height, occupancy, seed)
+        os.makedirs(self._base_path, exist_ok=True)
+        # Write to a temporary file first so that other processes never
+        # load a partial state
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as fh:
+            fh.write(state.to_bytes())
+        os.replace(tmp_path, path)
+        return state
+
+
+if __name__ == '__main__':
+    from game import constants
+    from game.replay import board_text
+    from game.solvers.cycle_store import parse_size
+
+    parser = argparse.ArgumentParser(
+        description="Generate and store mid and late game states"
+    )
+    parser.add_argument("sizes", nargs="+",
+                        help="Board sizes including the border, "
+                             "e.g. 20 or 30x20")
+    parser.add_argument("--occupancies", type=float, nargs="+",
+                        default=[0.5, 0.9],
+                        help="Fractions of the free tiles the snake covers")
+    parser.add_argument("--seeds", type=int, default=1,
+                        help="States per size and occupancy")
+    parser.add_argument("--path", default=constants.STATES_PATH,
+                        help="Directory to store states in")
+    parser.add_argument("--show", action="store_true",
+                        help="Print each board")
+    args = parser.parse_args()
+
+    store = StateStore(args.path)
+    for s in args.sizes:
+        w, h = parse_size(s)
+        for o in args.occupancies:
+            for seed in range(args.seeds):
+                st = store.get(w, h, o, seed)
+                print(f'{w}x{h} {o:g} seed {seed}: snake of '
+                      f'{len(st.snake)} tiles')
+                if args.show:
+                    print(board_text(st.environment()))
@@ -0,0 +1,40 @@
+import os
+from unittest import TestCase
+
+import pygame
+
+from game.game import Game
+from game.solvers.breadth_first_search_shortest import \
+    BreadthFirstSearchShortestPath
+
+
+class NullScoreLogger:
+    def log_score(self, file_name: str, score: int, **kwargs):
+        pass
+
+
+class TestGame(TestCase):
+    def setUp(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+
+    def tearDown(self) -> None:
+        pygame.quit()
+
+    def _game(self, fps: int, tps: int) -> Game:
+        return Game(
+            BreadthFirstSearchShortestPath(), fps, 8, 8, 80, 80,
+            NullScoreLogger(), 'Arial', 32, tps=tps
+        )
+
+    def test_unbounded_tps_steps_many_times_per_frame(self):
+        g = self._game(fps=20, tps=0)
+        self.assertTrue(g.tick())
+        self.assertGreater(g.ticks, 1)
+
+    def test_tps_slower_than_fps_skips_steps(self):
+        g = self._game(fps=100, tps=1)
+        for _ in range(5):
+            g.tick()
+        # Five frames take about 50ms, which isn't long enough for a step
+        self.assertEqual(g.ticks, 0)
@@ -0,0 +1,74 @@
+from unittest import TestCase
+from game.environment import action as act, death_reason
+from game.environment.environment import Environment
+from game.headless import HeadlessGame
+from game.solvers.abstract import AbstractModel
+from game.solvers.breadth_first_search_shortest import \
+    BreadthFirstSearchShortestPath
+from game.solvers.hamiltonian_cycle import HamiltonianCycle
+
+
+class LoopingSolver(AbstractModel):
+    """
+    Turns right every tick, circling forever without looking for fruit
+    """
+    def __init__(self):
+        super().__init__("Looping", "looping", "loop")
+
+    def next_action(self, environment: Environment) -> act.Action:
+        return act.action_to_relative_right(environment.snake.action)
+
+
+class TestHeadlessGame(TestCase):
+    def test_run_max_games(self):
+        g = HeadlessGame(HamiltonianCycle(), 6, 6)
+        stats = g.run(max_games=2)
+        self.assertEqual(stats.games, 2)
+        for result in stats.results:
+            self.assertGreaterEqual(result.score, 1)
+            self.assertEqual(result.won, result.reason is None)
+
+    def test_run_max_ticks(self):
+        g = HeadlessGame(HamiltonianCycle(), 6, 6)
+        stats = g.run(max_ticks=10)
+        self.assertEqual(stats.ticks, 10)
+        self.assertGreater(stats.ticks_per_second, 0)
+
+    def test_logs_each_games_seed(self):
+        logged = []
+
+        class ScoreLogger:
+            def log_score(self, file_name, score, seed=None, **kwargs):
+                logged.append(seed)
+
+        g = HeadlessGame(
+            BreadthFirstSearchShortestPath(), 6, 6,
+            score_logger=ScoreLogger(), seed=1
+        )
+        stats = g.run(max_games=3)
+        self.assertEqual(logged, [r.seed for r in stats.results])
+        self.assertEqual(len(set(logged)), 3)
+        self.assertNotIn(1, logged)
+
+    def test_game_follows_from_its_seed(self):
+        g = HeadlessGame(
+            BreadthFirstSearchShortestPath(), 8, 8, seed=2, record=True
+        )
+        for result in g.run(max_games=3).results:
+            env = Environment(8, 8)
+            env.init_wall()
+            env.new_game(result.seed)
+            self.assertEqual(
+                env.cell_of(env.snake.head()), result.replay.head
+            )
+            self.assertEqual(
+                env.cell_of(env.fruit.get_vector()), result.replay.fruit
+            )
+
+    def test_stalled_game_ends(self):
+        g = HeadlessGame(LoopingSolver(), 8, 8, seed=0, stall_factor=2)
+        stats = g.run(max_games=3)
+        self.assertEqual(stats.games, 3)
+        for result in stats.results:
+            self.assertIs(result.reason, death_reason.STALLED)
+        self.assertLess(stats.ticks, 3 * 2 * 36)
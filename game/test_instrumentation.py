@@ -0,0 +1,47 @@
+import random
+from unittest import TestCase
+
+from game.headless import HeadlessGame
+from game.instrumentation import Histogram, Instruments, SUB_BUCKETS
+from game.solvers.breadth_first_search_longest import \
+    BreadthFirstSearchLongestPath
+
+
+class TestHistogram(TestCase):
+    def test_small_values_are_exact(self):
+        h = Histogram()
+        for value in range(SUB_BUCKETS):
+            h.record(value)
+        self.assertEqual(h.percentile(50), SUB_BUCKETS // 2 - 1)
+        self.assertEqual(h.percentile(100), SUB_BUCKETS - 1)
+
+    def test_percentiles(self):
+        r = random.Random(0)
+        values = [r.randrange(10 ** 9) for _ in range(10000)]
+        h = Histogram()
+        for value in values:
+            h.record(value)
+        values.sort()
+        self.assertEqual(h.count, len(values))
+        self.assertEqual(h.max, values[-1])
+        for p in (50, 90, 99):
+            expected = values[int(p / 100 * len(values)) - 1]
+            self.assertAlmostEqual(
+                h.percentile(p) / expected, 1, delta=0.04
+            )
+
+
+class TestInstruments(TestCase):
+    def test_headless(self):
+        instruments = Instruments()
+        model = BreadthFirstSearchLongestPath()
+        g = HeadlessGame(model, 8, 8, seed=0, instruments=instruments)
+        g.run(max_ticks=200)
+        for phase in ('next_action', 'step'):
+            self.assertEqual(instruments.histograms[phase].count, 200)
+        counters = model.counters()
+        self.assertGreater(counters['nodes expanded'], 0)
+        self.assertGreater(counters['paths expanded'], 0)
+        report = instruments.report(counters)
+        self.assertIn('next_action', report)
+        self.assertIn('paths expanded', report)
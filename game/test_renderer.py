@@ -0,0 +1,100 @@
+import os
+from unittest import TestCase
+
+import pygame
+
+from game import colour
+from game.environment import action as act
+from game.environment.environment import Environment
+from game.grid_renderer import GridRenderer
+from game.renderer import Renderer, TILE_COLOURS
+from game.solvers.breadth_first_search_shortest import \
+    BreadthFirstSearchShortestPath
+from game.vector import to_direction_vectors
+
+
+class RendererTestCase(TestCase):
+    renderer = Renderer
+
+    def setUp(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        self._screen = pygame.display.set_mode((80, 60))
+        self._env = Environment(8, 6)
+        self._env.init_wall()
+        self._env.init_fruit()
+        self._env.init_snake()
+        self._renderer = self.renderer(
+            self._screen, self._env, 10, 10, 'Arial'
+        )
+
+    def tearDown(self) -> None:
+        pygame.quit()
+
+    def _assert_screen_matches(self):
+        env = self._env
+        for cell in range(env.cells_count()):
+            v = env.cell_vector(cell)
+            if v.y == 0:
+                # The score is drawn over the top wall
+                continue
+            expected = TILE_COLOURS[env.tile_at_cell(cell)]
+            pixel = self._screen.get_at((v.x * 10 + 5, v.y * 10 + 5))
+            self.assertEqual(tuple(pixel)[:3], tuple(expected))
+
+
+class TestRenderer(RendererTestCase):
+    def test_draw_all(self):
+        self.assertEqual(self._renderer.draw_all(),
+                         [self._screen.get_rect()])
+        self._assert_screen_matches()
+        self.assertEqual(self._renderer.draw_changes(), [])
+
+    def test_draw_changes(self):
+        env = self._env
+        self._renderer.draw_all()
+        for _ in range(20):
+            a = env.random_action()
+            if env.step(a) is not None:
+                env.init_snake()
+            dirty = self._renderer.draw_changes()
+            # Only the head, tail, fruit and perhaps score are redrawn
+            self.assertLessEqual(len(dirty), 5)
+            self._assert_screen_matches()
+
+    def test_score_redrawn_only_when_changed(self):
+        env = self._env
+        self._renderer.draw_all()
+        bfss = BreadthFirstSearchShortestPath()
+        path = bfss.shortest_path(
+            env, env.snake.head(), env.fruit.get_vector(),
+            env.snake.action.vector
+        )
+        actions = act.vectors_to_action(to_direction_vectors(path))
+        for i, a in enumerate(actions):
+            self.assertIsNone(env.step(a))
+            # Nothing in the top row changes except the score
+            redrew_score = any(
+                rect.top < 10 for rect in self._renderer.draw_changes()
+            )
+            self.assertEqual(redrew_score, i == len(actions) - 1)
+        self.assertEqual(tuple(self._screen.get_at((1, 1)))[:3],
+                         tuple(colour.BLACK))
+
+
+class TestGridRenderer(RendererTestCase):
+    renderer = GridRenderer
+
+    def test_draw_all(self):
+        self._renderer.draw_all()
+        self._assert_screen_matches()
+
+    def test_draw_changes(self):
+        env = self._env
+        self._renderer.draw_all()
+        for _ in range(20):
+            if env.step(env.random_action()) is not None:
+                env.init_snake()
+            self.assertEqual(self._renderer.draw_changes(),
+                             [self._screen.get_rect()])
+            self._assert_screen_matches()
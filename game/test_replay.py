@@ -0,0 +1,85 @@
+from unittest import TestCase
+from game import replay
+from game.environment import action as act
+from game.headless import HeadlessGame
+from game.replay import Replay, ReplayPlayer, board_text
+from game.solvers.breadth_first_search_shortest import \
+    BreadthFirstSearchShortestPath
+from game.solvers.hamiltonian_cycle import HamiltonianCycle
+from game.solvers.hamiltonian_cycle_optimised import HamiltonianCycleOptimised
+
+
+class StoppingSolver(BreadthFirstSearchShortestPath):
+    """
+    Plays like BFSS for a few moves, then makes the illegal move NONE
+    """
+    def __init__(self):
+        super().__init__()
+        self.moves = 0
+
+    def next_action(self, environment):
+        self.moves += 1
+        if self.moves % 5 == 0:
+            return act.NONE
+        return super().next_action(environment)
+
+
+class TestReplay(TestCase):
+    def test_replays_reproduce_games(self):
+        g = HeadlessGame(BreadthFirstSearchShortestPath(), 8, 8, seed=3,
+                         record=True)
+        stats = g.run(max_games=5)
+        for result in stats.results:
+            r = Replay.from_bytes(result.replay.to_bytes())
+            self.assertEqual(len(r), result.steps + (0 if result.won else 1))
+            player = ReplayPlayer(r)
+            player.seek(len(r))
+            self.assertTrue(player.finished())
+            self.assertEqual(player.environment.reward(), result.score)
+            self.assertIs(player.reason, result.reason)
+
+    def test_recording_does_not_change_games(self):
+        def scores(record):
+            g = HeadlessGame(BreadthFirstSearchShortestPath(), 8, 8, seed=4,
+                             record=record)
+            return g.run(max_games=5).scores
+        self.assertEqual(scores(True), scores(False))
+
+    def test_illegal_moves_are_recorded(self):
+        def results(record):
+            g = HeadlessGame(StoppingSolver(), 8, 8, seed=4, record=record)
+            return g.run(max_games=3).results
+        recorded = results(True)
+        self.assertEqual(
+            [(r.score, r.steps, r.reason) for r in recorded],
+            [(r.score, r.steps, r.reason) for r in results(False)]
+        )
+        for result in recorded:
+            r = Replay.from_bytes(result.replay.to_bytes())
+            self.assertEqual(r.last, act.NONE)
+            player = ReplayPlayer(r)
+            player.seek(len(r))
+            self.assertEqual(player.environment.reward(), result.score)
+            self.assertIs(player.reason, result.reason)
+
+    def test_two_bits_per_move(self):
+        g = HeadlessGame(HamiltonianCycleOptimised(), 12, 12, seed=1,
+                         record=True)
+        r = g.run(max_games=1).results[0].replay
+        self.assertEqual(len(r.to_bytes()),
+                         replay.HEADER.size + -(-len(r) // 4))
+
+    def test_seek(self):
+        g = HeadlessGame(HamiltonianCycle(), 12, 12, seed=2, record=True)
+        r = g.run(max_games=1).results[0].replay
+        self.assertGreater(len(r), replay.KEYFRAME_INTERVAL * 2)
+        boards = {}
+        player = ReplayPlayer(r)
+        for tick in (0, 5, replay.KEYFRAME_INTERVAL + 7, len(r)):
+            player.seek(tick)
+            boards[tick] = board_text(player.environment)
+        # Seeking backwards and forwards again restores the same states
+        for tick in (5, len(r), replay.KEYFRAME_INTERVAL + 7, 0):
+            player.seek(tick)
+            self.assertEqual(player.tick, tick)
+            self.assertEqual(board_text(player.environment), boards[tick])
@@ -0,0 +1,94 @@
+import os
+import tempfile
+from unittest import TestCase
+from game.environment import death_reason
+from game.headless import HeadlessGame
+from game.replay import ReplayPlayer
+from game import replay_archive
+from game.replay_archive import ReplayArchive, INDEX_ENTRY
+from game.solvers.breadth_first_search_shortest import \
+    BreadthFirstSearchShortestPath
+
+
+class TestReplayArchive(TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self._archive = ReplayArchive(os.path.join(self._dir.name, 'games'))
+
+    def tearDown(self) -> None:
+        self._archive.close()
+        self._dir.cleanup()
+
+    def test_empty(self):
+        self.assertEqual(len(self._archive), 0)
+        self.assertEqual(list(self._archive.find()), [])
+
+    def test_append_and_find(self):
+        g = HeadlessGame(BreadthFirstSearchShortestPath(), 8, 8, seed=1,
+                         record=True)
+        results = g.run(max_games=6).results
+        for result in results:
+            self._archive.append('bfss', result.score, result.reason,
+                                 result.replay)
+        self.assertEqual(len(self._archive), 6)
+        self.assertEqual(
+            os.path.getsize(os.path.join(self._dir.name, 'games.index')),
+            6 * INDEX_ENTRY.size
+        )
+
+        # Any episode can be played back straight from the archive
+        for episode in (4, 0):
+            replay = self._archive.replay(episode)
+            player = ReplayPlayer(replay)
+            player.seek(len(replay))
+            self.assertEqual(player.environment.reward(),
+                             results[episode].score)
+
+        threshold = sorted(r.score for r in results)[3]
+        found = list(self._archive.find(
+            solver='bfss', reason=death_reason.HIT_SNAKE,
+            min_score=threshold
+        ))
+        expected = [
+            i for i, r in enumerate(results)
+            if r.reason is death_reason.HIT_SNAKE and r.score >= threshold
+        ]
+        self.assertEqual([e.episode for e in found], expected)
+        self.assertEqual(list(self._archive.find(solver='hc')), [])
+
+        # Episodes appended after the archive was read are found too, and
+        # the index is mapped again without leaving the old mapping open
+        index = self._archive._index
+        self._archive.append('hc', 5, None, results[0].replay)
+        self.assertEqual(
+            [e.episode for e in self._archive.find(won=True)], [6]
+        )
+        self.assertTrue(index.closed)
+
+    def test_headless_appends_as_games_end(self):
+        g = HeadlessGame(BreadthFirstSearchShortestPath(), 8, 8, seed=1,
+                         replay_archive=self._archive)
+        g.run(max_games=1)
+        # Readers see each game as soon as it ends
+        reader = ReplayArchive(os.path.join(self._dir.name, 'games'))
+        self.assertEqual(len(reader), 1)
+        g.run(max_games=3)
+        self.assertEqual(len(reader), 3)
+        self.assertEqual([e.score for e in reader.entries()],
+                         g.stats.scores)
+        # Replays aren't also kept in memory
+        self.assertEqual([r.replay for r in g.stats.results], [None] * 3)
+        reader.close()
+
+    def test_one_writer_at_a_time(self):
+        replay = HeadlessGame(BreadthFirstSearchShortestPath(), 8, 8, seed=1,
+                              record=True).run(max_games=1).results[0].replay
+        self.assertEqual(self._archive.append('bfss', 1, None, replay), 0)
+        other = ReplayArchive(os.path.join(self._dir.name, 'games'))
+        if replay_archive.fcntl is not None:
+            with self.assertRaises(Exception):
+                other.append('bfss', 2, None, replay)
+        self._archive.close()
+        self.assertEqual(other.append('bfss', 2, None, replay), 1)
+        other.close()
+        self.assertEqual([e.score for e in self._archive.entries()], [1, 2])
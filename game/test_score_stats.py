@@ -0,0 +1,60 @@
+import os
+import statistics
+import tempfile
+from unittest import TestCase
+from game.environment import death_reason
+from game.score_stats import RunningStats, SolverStats, LogFollower, \
+    summarise
+from game.scores import ScoreRecord
+
+
+class TestRunningStats(TestCase):
+    def test_matches_statistics(self):
+        values = [3, 1, 4, 1, 5, 9, 2, 6]
+        stats = RunningStats()
+        for v in values:
+            stats.add(v)
+        self.assertEqual(stats.count, len(values))
+        self.assertAlmostEqual(stats.mean, statistics.mean(values))
+        self.assertAlmostEqual(stats.variance, statistics.variance(values))
+        self.assertEqual((stats.min, stats.max), (1, 9))
+
+
+class TestLogFollower(TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self._follower = LogFollower(self._dir.name)
+        self._stats = {}
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def _append(self, file_name: str, data: bytes):
+        with open(os.path.join(self._dir.name, file_name), 'ab') as fh:
+            fh.write(data)
+
+    def test_follow_csv(self):
+        self._append('bfss.csv', b'3\r\n5\r\n1')
+        summarise(self._follower, self._stats)
+        self.assertEqual(self._stats['bfss'].scores.count, 2)
+        # The partial line is read once it's finished
+        self._append('bfss.csv', b'0\r\n')
+        summarise(self._follower, self._stats)
+        stats = self._stats['bfss']
+        self.assertEqual(stats.scores.count, 3)
+        self.assertEqual(stats.scores.max, 10)
+        self.assertEqual(stats.percentile(50), 5)
+
+    def test_follow_binary(self):
+        won = ScoreRecord(64, steps=500).pack()
+        died = ScoreRecord(10, steps=40, reason=death_reason.HIT_SNAKE).pack()
+        self._append('hc.scores', won + died[:7])
+        summarise(self._follower, self._stats)
+        self.assertEqual(self._stats['hc'].scores.count, 1)
+        self._append('hc.scores', died[7:])
+        summarise(self._follower, self._stats)
+        stats: SolverStats = self._stats['hc']
+        self.assertEqual(stats.scores.count, 2)
+        self.assertEqual(stats.wins, 1)
+        self.assertEqual(stats.steps.mean, 270)
+        self.assertEqual(stats.percentile(100), 64)
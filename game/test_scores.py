@@ -0,0 +1,110 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+from game.environment import death_reason
+from game import scores
+from game.score_store import ScoreStore, DATABASE_NAME
+from game.scores import ScoreLogger, read_records
+
+
+class TestScoreLogger(TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def test_csv_written_on_close(self):
+        logger = ScoreLogger(self._dir.name, flush_interval=60)
+        for score in range(5):
+            logger.log_score('bfss', score)
+        path = os.path.join(self._dir.name, 'bfss.csv')
+        self.assertFalse(os.path.exists(path))
+        logger.close()
+        with open(path) as fh:
+            self.assertEqual(fh.read().split(), ['0', '1', '2', '3', '4'])
+
+    def test_full_batch_is_flushed_in_the_background(self):
+        logger = ScoreLogger(self._dir.name, batch_size=3, flush_interval=60)
+        for score in range(3):
+            logger.log_score('bfss', score)
+        path = os.path.join(self._dir.name, 'bfss.csv')
+        deadline = time.monotonic() + 5
+        while not os.path.exists(path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(os.path.exists(path))
+        logger.close()
+
+    def test_binary(self):
+        logger = ScoreLogger(self._dir.name, scores.BINARY)
+        logger.log_score('hc', 10, steps=99, reason=death_reason.HIT_WALL,
+                         seed=3, duration=0.25)
+        logger.log_score('hc', 100, steps=1000)
+        logger.close()
+        records = list(read_records(os.path.join(self._dir.name, 'hc.scores')))
+        self.assertEqual(
+            [(r.score, r.steps, r.reason, r.seed, r.duration)
+             for r in records],
+            [(10, 99, death_reason.HIT_WALL, 3, 0.25),
+             (100, 1000, None, None, 0.0)]
+        )
+
+    def test_sqlite(self):
+        logger = ScoreLogger(self._dir.name, scores.SQLITE)
+        for score in (3, 5, 5, 8):
+            logger.log_score('hc', score, reason=death_reason.HIT_SNAKE,
+                             width=10, height=10)
+        logger.log_score('hc', 64, width=10, height=10)
+        logger.log_score('hc', 1, width=12, height=12)
+        logger.log_score('bfss', 2, width=10, height=10)
+        logger.close()
+
+        store = ScoreStore(os.path.join(self._dir.name, DATABASE_NAME))
+        summaries = store.summaries(solver='hc', size=(10, 10))
+        self.assertEqual(len(summaries), 1)
+        summary = summaries[0]
+        self.assertEqual(summary.games, 5)
+        self.assertEqual(summary.mean, 17)
+        self.assertEqual(summary.win_rate, 0.2)
+        self.assertEqual(summary.percentile(50), 5)
+        self.assertEqual(summary.percentile(90), 64)
+        self.assertEqual(summary.percentile(0), 3)
+
+        self.assertEqual(
+            [(s.solver, s.width, s.games) for s in store.summaries()],
+            [('bfss', 10, 1), ('hc', 10, 5), ('hc', 12, 1)]
+        )
+        self.assertEqual(store.summaries(since=time.time() + 60), [])
+        store.close()
+
+    def test_summaries_since(self):
+        store = ScoreStore(os.path.join(self._dir.name, DATABASE_NAME))
+        store.add(
+            ('hc', 10, 10, score, 0, 0, None, None, 0.0, float(score))
+            for score in range(1000)
+        )
+        self.assertTrue(store._is_recent(995))
+        self.assertFalse(store._is_recent(500))
+        for since in (995, 500):
+            summary, = store.summaries(since=since)
+            self.assertEqual(summary.games, 1000 - since)
+            summary, = store.summaries(solver='hc', since=since)
+            self.assertEqual(summary.games, 1000 - since)
+        store.close()
+
+    def test_background_error_is_raised(self):
+        # Scores can't be written under a path that is a file
+        base_path = os.path.join(self._dir.name, 'file')
+        open(base_path, 'w').close()
+        logger = ScoreLogger(os.path.join(base_path, 'scores'), batch_size=1,
+                             flush_interval=60)
+        logger.log_score('bfss', 1)
+        deadline = time.monotonic() + 5
+        while logger._error is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        with self.assertRaises(OSError):
+            logger.log_score('bfss', 2)
+        logger.close()
+        with self.assertRaises(Exception):
+            logger.log_score('bfss', 3)
@@ -0,0 +1,68 @@
+import random
+import tempfile
+from unittest import TestCase
+
+from game.environment import action as act, tile
+from game.environment.environment import Environment
+from game.solvers.breadth_first_search_shortest import \
+    BreadthFirstSearchShortestPath
+from game.synthetic import SyntheticState, StateStore, generate, random_path
+
+
+class TestSynthetic(TestCase):
+    def test_random_path(self):
+        env = Environment(9, 7)
+        env.init_wall()
+        path = random_path(env, random.Random(0))
+        self.assertEqual(len(path), len(set(path)))
+        self.assertEqual(len(path), env.available_tiles_count())
+        for a, b in zip(path, path[1:]):
+            self.assertIn(b, env.neighbours(a))
+
+    def test_generate(self):
+        for occupancy in (0, 0.5, 0.9, 1):
+            state = generate(12, 10, occupancy, seed=3)
+            env = state.environment()
+            free = env.available_tiles_count()
+            self.assertEqual(
+                len(env.snake), max(1, min(free - 1, round(occupancy * free)))
+            )
+            self.assertEqual(
+                env.free_tiles_count(), free - len(env.snake) - 1
+            )
+            self.assertEqual(
+                env.tile_at(env.fruit.get_vector()), tile.FRUIT
+            )
+            body = list(env.snake.get_vectors())
+            for a, b in zip(body, body[1:]):
+                self.assertIn(env.cell_of(b), env.neighbours(env.cell_of(a)))
+            if len(body) > 1:
+                self.assertEqual(
+                    env.snake.action, act.vector_to_action(body[0] - body[1])
+                )
+            # The head always has somewhere to go
+            self.assertIsNotNone(
+                BreadthFirstSearchShortestPath().shortest_path(
+                    env, env.snake.head(), env.fruit.get_vector(),
+                    env.snake.action.vector
+                )
+            )
+
+    def test_seed(self):
+        def cells(seed):
+            state = generate(20, 20, 0.9, seed)
+            return state.snake, state.fruit
+        self.assertEqual(cells(1), cells(1))
+        self.assertNotEqual(cells(1), cells(2))
+
+    def test_store(self):
+        with tempfile.TemporaryDirectory() as path:
+            store = StateStore(path)
+            state = store.get(12, 12, 0.9, 0)
+            loaded = StateStore(path).get(12, 12, 0.9, 0)
+            self.assertEqual(loaded.snake, state.snake)
+            self.assertEqual(loaded.action, state.action)
+            self.assertEqual(loaded.fruit, state.fruit)
+            self.assertNotEqual(store.get(12, 12, 0.9, 1).snake, state.snake)
+        with self.assertRaises(Exception):
+            SyntheticState.from_bytes(b'\0' * 32)
@@ -0,0 +1,62 @@
+from unittest import TestCase
+from game import tournament
+from game.environment import death_reason
+from game.headless import GameResult
+
+
+class TestTournament(TestCase):
+    def test_build_jobs(self):
+        jobs = tournament.build_jobs(['a', 'b'], [8, 12], [0, 1, 2], 5)
+        self.assertEqual(len(jobs), 12)
+        self.assertEqual(
+            {(j.solver, j.size, j.seed) for j in jobs},
+            {(s, z, d) for s in 'ab' for z in (8, 12) for d in (0, 1, 2)}
+        )
+
+    def test_solver_report(self):
+        job = tournament.Job('hamiltonian_cycle', 6, 0, 3)
+        report = tournament.SolverReport(job.solver, job.size)
+        report.add(tournament.JobResult(job, [
+            GameResult(16, 40, True, None),
+            GameResult(4, 20, False, death_reason.HIT_WALL),
+            GameResult(1, 4, False, death_reason.STALLED),
+        ], 67, 0.0067))
+        self.assertEqual(report.mean_score, 7)
+        self.assertEqual(report.median_score, 4)
+        self.assertAlmostEqual(report.win_rate, 1 / 3)
+        self.assertAlmostEqual(report.steps_per_fruit, 64 / 18)
+        self.assertAlmostEqual(report.ms_per_action, 0.1)
+        self.assertEqual(report.stalled, 1)
+
+    def test_run_job(self):
+        job = tournament.Job('hamiltonian_cycle', 6, 0, 2)
+        result = tournament.run_job(job)
+        self.assertIs(result.job, job)
+        self.assertEqual(len(result.results), 2)
+
+    def test_jobs_carry_stall_factor(self):
+        jobs = tournament.build_jobs(['a'], [8], [0], 5, stall_factor=2)
+        self.assertEqual(jobs[0].stall_factor, 2)
+
+    def test_run_job_is_reproducible(self):
+        job = tournament.Job('breadth_first_search_shortest', 8, 5, 3)
+        first, second = tournament.run_job(job), tournament.run_job(job)
+        self.assertEqual(
+            [(r.score, r.steps) for r in first.results],
+            [(r.score, r.steps) for r in second.results]
+        )
+
+    def test_run_tournament(self):
+        # Every game that doesn't eat on its first step stalls
+        jobs = tournament.build_jobs(
+            ['breadth_first_search_shortest'], [6], [0, 1], 3, stall_factor=0
+        )
+        report, = tournament.run_tournament(jobs, workers=2)
+        self.assertEqual(len(report.results), 6)
+        reasons = [r.reason for r in report.results]
+        self.assertIn(death_reason.STALLED, reasons)
+        self.assertEqual(report.stalled, reasons.count(death_reason.STALLED))
+        for reason in reasons:
+            self.assertIs(
+                death_reason.from_code(death_reason.to_code(reason)), reason
+            )
@@ -0,0 +1,13 @@
+from unittest import TestCase
+from game.vector import Vector
+
+
+class TestVector(TestCase):
+    def test_hash(self):
+        self.assertEqual(hash(Vector(3, 4)), hash(Vector(3, 4)))
+        self.assertNotEqual(hash(Vector(1, 12)), hash(Vector(11, 2)))
+        self.assertEqual(len({Vector(1, 12), Vector(11, 2)}), 2)
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            Vector(1, 2).z = 3
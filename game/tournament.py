@@ -0,0 +1,162 @@
+import itertools
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Dict, Tuple
+
+from game.environment import death_reason
+from game.headless import HeadlessGame, GameResult, STALL_FACTOR
+from game.solvers import cycles
+from game.solvers.abstract import AbstractModel
+from game.solvers.breadth_first_search_longest import \
+    BreadthFirstSearchLongestPath
+from game.solvers.breadth_first_search_shortest import \
+    BreadthFirstSearchShortestPath
+from game.solvers.cycle_store import CycleStore
+from game.solvers.hamiltonian_cycle import HamiltonianCycle
+from game.solvers.hamiltonian_cycle_optimised import HamiltonianCycleOptimised
+
+# Solvers that can play without user input
+SOLVERS = (
+    BreadthFirstSearchShortestPath,
+    BreadthFirstSearchLongestPath,
+    HamiltonianCycle,
+    HamiltonianCycleOptimised,
+)
+
+
+def new_solver(short_name: str) -> AbstractModel:
+    for solver in SOLVERS:
+        model = solver()
+        if model.short_name == short_name:
+            return model
+    raise Exception(f'no solver named {short_name}')
+
+
+class Job:
+    def __init__(self, solver: str, size: int, seed: int, games: int,
+                 stall_factor: Optional[int] = STALL_FACTOR):
+        """
+        :param stall_factor: See HeadlessGame. A stuck game is ended
+        rather than holding up its worker forever.
+        """
+        self.solver = solver
+        self.size = size
+        self.seed = seed
+        self.games = games
+        self.stall_factor = stall_factor
+
+
+class JobResult:
+    def __init__(self, job: Job, results: List[GameResult], ticks: int,
+                 action_time: float):
+        self.job = job
+        self.results = results
+        self.ticks = ticks
+        self.action_time = action_time
+
+
+def run_job(job: Job) -> JobResult:
+    g = HeadlessGame(
+        game_model=new_solver(job.solver),
+        horizontal_tiles=job.size,
+        vertical_tiles=job.size,
+        seed=job.seed,
+        stall_factor=job.stall_factor
+    )
+    stats = g.run(max_games=job.games)
+    return JobResult(job, stats.results, stats.ticks, stats.action_time)
+
+
+class SolverReport:
+    """
+    Results of every job played by one solver on one board size
+    """
+    def __init__(self, solver: str, size: int):
+        self.solver = solver
+        self.size = size
+        self.results: List[GameResult] = []
+        self.ticks = 0
+        self.action_time = 0.0
+
+    def add(self, job_result: JobResult):
+        self.results.extend(job_result.results)
+        self.ticks += job_result.ticks
+        self.action_time += job_result.action_time
+
+    @property
+    def mean_score(self) -> float:
+        return statistics.mean(r.score for r in self.results)
+
+    @property
+    def median_score(self) -> float:
+        return statistics.median(r.score for r in self.results)
+
+    @property
+    def win_rate(self) -> float:
+        return sum(1 for r in self.results if r.won) / len(self.results)
+
+    @property
+    def stalled(self) -> int:
+        return sum(
+            1 for r in self.results if r.reason is death_reason.STALLED
+        )
+
+    @property
+    def steps_per_fruit(self) -> Optional[float]:
+        # Every game starts with a snake of length 1
+        fruit = sum(r.score - 1 for r in self.results)
+        if fruit == 0:
+            return None
+        return sum(r.steps for r in self.results) / fruit
+
+    @property
+    def ms_per_action(self) -> float:
+        if self.ticks == 0:
+            return 0.0
+        return self.action_time / self.ticks * 1000
+
+
+def build_jobs(solvers: List[str], sizes: List[int], seeds: List[int],
+               games: int, stall_factor: Optional[int] = STALL_FACTOR
+               ) -> List[Job]:
+    return [
+        Job(solver, size, seed, games, stall_factor)
+        for solver, size, seed in itertools.product(solvers, sizes, seeds)
+    ]
+
+
+def run_tournament(jobs: List[Job], workers: Optional[int] = None,
+                   cycle_store: Optional[CycleStore] = None
+                   ) -> List[SolverReport]:
+    reports: Dict[Tuple[str, int], SolverReport] = {}
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=cycles.use_store,
+            initargs=(cycle_store,)
+    ) as executor:
+        for job_result in executor.map(run_job, jobs):
+            job = job_result.job
+            key = (job.solver, job.size)
+            if key not in reports:
+                reports[key] = SolverReport(job.solver, job.size)
+            reports[key].add(job_result)
+    return sorted(reports.values(), key=lambda r: (r.size, r.solver))
+
+
+def format_report(reports: List[SolverReport]) -> str:
+    lines = [
+        f'{"solver":<30} {"size":>5} {"games":>6} {"mean":>8} '
+        f'{"median":>8} {"win %":>6} {"stalled":>8} {"steps/fruit":>12} '
+        f'{"ms/action":>10}'
+    ]
+    for r in reports:
+        steps_per_fruit = r.steps_per_fruit
+        steps_per_fruit = '-' if steps_per_fruit is None \
+            else f'{steps_per_fruit:.2f}'
+        lines.append(
+            f'{r.solver:<30} {r.size:>5} {len(r.results):>6} '
+            f'{r.mean_score:>8.2f} {r.median_score:>8.1f} '
+            f'{r.win_rate * 100:>6.1f} {r.stalled:>8} {steps_per_fruit:>12} '
+            f'{r.ms_per_action:>10.4f}'
+        )
+    return '\n'.join(lines)
@@ -3,17 +3,22 @@ from typing import List
 
 class Vector:
     """
-    Used as both positional and directional vector
+    Used as both positional and directional vector.
+    Vectors are shared between cells (see Environment.cell_vector),
+    so they must never be modified.
     """
+    __slots__ = ('x', 'y', '_hash')
+
     def __init__(self, x: int, y: int):
         self.x = x
         self.y = y
+        self._hash = hash((x, y))
 
     def __eq__(self, other: 'Vector') -> bool:
         return self.x == other.x and self.y == other.y
 
     def __hash__(self) -> int:
-        return hash(str(self.x) + str(self.y))
+        return self._hash
 
     def reverse(self) -> 'Vector':
         return Vector(-self.x, -self.y)
@@ -1,17 +1,19 @@
 import argparse
+import atexit
 import random
 
-import pygame
-
-from game.game import Game
-from game import constants
+from game import constants, scores
 from game.solvers.breadth_first_search_longest import \
     BreadthFirstSearchLongestPath
 from game.solvers.breadth_first_search_shortest import \
     BreadthFirstSearchShortestPath
+from game.solvers import cycles
+from game.solvers.cycle_store import CycleStore
 from game.solvers.hamiltonian_cycle import HamiltonianCycle
 from game.solvers.hamiltonian_cycle_optimised import HamiltonianCycleOptimised
 from game.solvers.human import HumanSolver
+from game.instrumentation import Instruments
+from game.replay_archive import ReplayArchive
 from game.scores import ScoreLogger
 
 models = [
@@ -34,36 +36,187 @@ def args():
         )
 
     parser.add_argument("-fps", "--fps", type=int, default=constants.FPS,
-                        help="Frames per second")
-    return parser.parse_args()
+                        help="Frames drawn per second")
+    parser.add_argument("-tps", "--tps", type=int, default=constants.TPS,
+                        help="Game ticks per second, or 0 to play as fast "
+                             "as possible")
+    parser.add_argument("--size", type=int, default=constants.HORZ_TILES,
+                        help="Board size for a windowed game, including the "
+                             "border")
+    parser.add_argument("--surfarray", action="store_true",
+                        help="Draw the whole board at once each frame, "
+                             "which is faster on very large boards")
+    parser.add_argument("--headless", action="store_true",
+                        help="Play without a display, as fast as possible")
+    parser.add_argument("--ticks", type=int, default=None,
+                        help="Stop a headless run after this many ticks")
+    parser.add_argument("--games", type=int, default=None,
+                        help="Stop a headless run after this many games")
+    parser.add_argument("--score-format", choices=scores.FORMATS,
+                        default=scores.CSV,
+                        help="Log just scores to CSVs, each game's score, "
+                             "steps, death reason, seed and duration to "
+                             "compact binary files, or everything to an "
+                             "indexed SQLite database")
+    parser.add_argument("--replays", default=None,
+                        help="Append a replay of every headless game to "
+                             "this archive")
+    parser.add_argument("--tournament", action="store_true",
+                        help="Play the selected solvers (or all of them) "
+                             "against each other headless")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[constants.HORZ_TILES],
+                        help="Tournament board sizes, including the border")
+    parser.add_argument("--seeds", type=int, default=4,
+                        help="Tournament seeds per solver and board size")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for where fruit and snakes are placed, "
+                             "or the first tournament seed. Picked at "
+                             "random and printed if not given.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Tournament worker processes")
+    parser.add_argument("--cycles", nargs="?", const=constants.CYCLES_PATH,
+                        default=None,
+                        help="Load Hamiltonian cycles from, and save new "
+                             "ones to, this directory (default: "
+                             f"{constants.CYCLES_PATH})")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Time each phase of every tick and count the "
+                             "solver's work, and print percentiles on exit")
+    parsed = parser.parse_args()
+    # Smaller boards have no room inside the walls for both the snake and
+    # a fruit, and on larger ones tiles would be less than a pixel across
+    min_size = 4
+    max_size = min(constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT)
+    for name, sizes in (('--size', [parsed.size]), ('--sizes', parsed.sizes)):
+        if not all(min_size <= size <= max_size for size in sizes):
+            parser.error(f'{name} must be from {min_size} to {max_size}')
+    if parsed.instrument and parsed.tournament:
+        parser.error('--instrument can not be used with --tournament')
+    return parsed
 
 
-if __name__ == '__main__':
-    pygame.init()
-    pygame.display.set_caption(constants.NAME)
+def play_headless(game_model, score_logger, max_ticks, max_games, seed,
+                  replays_path, instruments):
+    from game.headless import HeadlessGame
 
-    args = args()
+    archive = None
+    if replays_path is not None:
+        archive = ReplayArchive(replays_path)
+    g = HeadlessGame(
+        game_model=game_model,
+        horizontal_tiles=constants.HORZ_TILES,
+        vertical_tiles=constants.VERT_TILES,
+        score_logger=score_logger,
+        seed=seed,
+        instruments=instruments,
+        replay_archive=archive
+    )
+    try:
+        g.run(max_ticks=max_ticks, max_games=max_games)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if archive is not None:
+            archive.close()
+    print(f'{game_model.short_name}: {g.stats}')
+    if instruments is None:
+        # Otherwise they're printed with the timings on exit
+        for name, count in game_model.counters().items():
+            print(f'{name}: {count}')
 
-    selected_game_model = random.choice(models)
-    for game_model in models:
-        if game_model.short_name in args and vars(args)[game_model.short_name]:
-            selected_game_model = game_model
 
-    score_logger = ScoreLogger(constants.SCORES_PATH)
+def play_tournament(game_models, sizes, first_seed, seeds, games, workers,
+                    cycle_store):
+    from game import tournament
+
+    solvers = [m.short_name for m in game_models]
+    if not solvers:
+        solvers = [s().short_name for s in tournament.SOLVERS]
+    jobs = tournament.build_jobs(
+        solvers, sizes, list(range(first_seed, first_seed + seeds)), games
+    )
+    reports = tournament.run_tournament(jobs, workers, cycle_store)
+    print(tournament.format_report(reports))
+
+
+def play(game_model, score_logger, fps, tps, size, surfarray, seed,
+         instruments):
+    import pygame
+    from game.game import Game
+    from game.renderer import Renderer
+
+    renderer = Renderer
+    if surfarray:
+        from game.grid_renderer import GridRenderer
+        renderer = GridRenderer
+
+    pygame.init()
+    pygame.display.set_caption(constants.NAME)
 
     g = Game(
-        game_model=selected_game_model,
-        fps=args.fps,
-        horizontal_tiles=constants.HORZ_TILES,
-        vertical_tiles=constants.VERT_TILES,
+        game_model=game_model,
+        fps=fps,
+        tps=tps,
+        horizontal_tiles=size,
+        vertical_tiles=size,
         screen_width=constants.SCREEN_WIDTH,
         screen_height=constants.SCREEN_HEIGHT,
         score_logger=score_logger,
         font=constants.FONT,
-        screen_depth=constants.SCREEN_DEPTH
+        screen_depth=constants.SCREEN_DEPTH,
+        renderer=renderer,
+        seed=seed,
+        instruments=instruments
     )
 
     play_game = True
     while play_game:
         play_game = g.tick()
     pygame.quit()
+
+
+if __name__ == '__main__':
+    args = args()
+
+    seed = args.seed
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+        print(f'seed: {seed}')
+
+    selected_game_model = random.Random(seed).choice(models)
+    for game_model in models:
+        if game_model.short_name in args and vars(args)[game_model.short_name]:
+            selected_game_model = game_model
+
+    score_logger = ScoreLogger(
+        constants.SCORES_PATH, args.score_format
+    )
+    cycle_store = None
+    if args.cycles is not None:
+        cycle_store = CycleStore(args.cycles)
+        cycles.use_store(cycle_store)
+
+    instruments = None
+    if args.instrument:
+        instruments = Instruments()
+        atexit.register(
+            lambda: print(instruments.report(selected_game_model.counters()))
+        )
+
+    if args.tournament:
+        play_tournament(
+            [m for m in models if vars(args)[m.short_name]],
+            args.sizes, seed, args.seeds, args.games or 10,
+            args.workers, cycle_store
+        )
+    elif args.headless:
+        play_headless(
+            selected_game_model, score_logger, args.ticks, args.games, seed,
+            args.replays, instruments
+        )
+    else:
+        play(
+            selected_game_model, score_logger, args.fps, args.tps, args.size,
+            args.surfarray, seed, instruments
+        )